@@ -20,3 +20,10 @@ if __name__ == '__main__':
         Linq(range(10**4))
         .last(is_prime))
     # => 9973
+
+    print(
+        Linq(range(10**4))
+        .as_parallel()
+        .where(is_prime)
+        .last())
+    # => 9973
@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides ``AsyncLinq`` class, which executes ``Linq`` operators
+over async iterables with asyncio.
+"""
+
+import asyncio
+from collections import defaultdict, deque
+import inspect
+from ilinq.ilinq import Linq
+from ilinq.iprobe import IProbe
+from ilinq.istats import IStats
+
+
+class AsyncLinq(object):
+    """
+    Class for handling Linq like C# over async iterables.
+
+    ``source`` may be an async iterable or an iterable.
+    Every operator appends a stage and returns a new ``AsyncLinq``.  Items
+    stream through the stages by ``async for`` and aggregates are
+    coroutines.  Functions may be normal functions or coroutine functions.
+
+    >>> async def numbers():
+    ...     for n in range(10):
+    ...         yield n
+    >>> async def main():
+    ...     return await AsyncLinq(numbers()) \\
+    ...         .where(lambda n: n % 2 == 0).take(3).to_list()
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(main())
+    [0, 2, 4]
+    >>> loop.close()
+    """
+    def __init__(self, source=None, stages=()):
+        if source is None:
+            source = list()
+        self._source = source
+        self._stages = tuple(stages)
+
+    def _then(self, gen_f, *args):
+        return AsyncLinq(self._source, self._stages + ((gen_f, args),))
+
+    def where(self, cond_f=None, concurrency=1):
+        """
+        Return the AsyncLinq filtered by ``cond_f``.
+        At most ``concurrency`` calls of ``cond_f`` are awaited at once and
+        the order of items is kept.
+        """
+        if cond_f is None:
+            return self
+        return self._then(_where, cond_f, concurrency)
+
+    def select(self, select_f=None, concurrency=1):
+        """
+        Return the AsyncLinq selected by ``select_f``.
+        At most ``concurrency`` calls of ``select_f`` are awaited at once and
+        the order of items is kept.
+
+        >>> async def fetch(n):
+        ...     await asyncio.sleep(0.1)
+        ...     return n * n
+        >>> async def main():
+        ...     return await AsyncLinq(range(5)) \\
+        ...         .select(fetch, concurrency=5).to_list()
+        >>> loop = asyncio.new_event_loop()
+        >>> loop.run_until_complete(main())
+        [0, 1, 4, 9, 16]
+        >>> loop.close()
+        """
+        if select_f is None:
+            return self
+        return self._then(_select, select_f, concurrency)
+
+    def select_many(self, select_f=None, concurrency=1):
+        """
+        Return the AsyncLinq selected by ``select_f`` and flatten.
+        ``select_f(item)`` may return an iterable or an async iterable.
+        """
+        return self.select(select_f, concurrency)._then(_flatten)
+
+    def take(self, num):
+        """
+        Return first ``num`` items of this query.
+        """
+        return self._then(_take, num)
+
+    def take_while(self, cond_f=None):
+        """
+        Return first some items such that ``cond_f(item)``.
+        """
+        if cond_f is None:
+            return self
+        return self._then(_take_while, cond_f)
+
+    def skip(self, num):
+        """
+        Return the AsyncLinq skipped first ``num`` items.
+        """
+        return self._then(_skip, num)
+
+    def skip_while(self, cond_f=None):
+        """
+        Return the AsyncLinq skipped first some items such that
+        ``cond_f(item)``.
+        """
+        if cond_f is None:
+            return self
+        return self._then(_skip_while, cond_f)
+
+    def distinct(self, key_f=None):
+        """
+        Return the AsyncLinq deleted duplicates.
+        """
+        return self._then(_distinct, key_f)
+
+    async def to_list(self):
+        """
+        Return the list of result items.
+        """
+        return [item async for item in self]
+
+    async def to_linq(self):
+        """
+        Return the ``Linq`` of result items.
+        """
+        return Linq(await self.to_list())
+
+    async def first(self, cond_f=None):
+        """
+        Return the first element with ``cond_f(item)``.
+        """
+        async for item in self:
+            if cond_f is None or await _call(cond_f, item):
+                return item
+        raise IndexError('This linq with condition is Empty.')
+
+    async def first_or_default(self, cond_f=None, default=None):
+        """
+        Return the first element with ``cond_f(item)`` and ``default`` value
+        is ``default``.
+        """
+        try:
+            return await self.first(cond_f)
+        except IndexError:
+            return default
+
+    async def count(self, cond_f=None):
+        """
+        Return the number of items with condition that ``cond_f(item)``.
+        """
+        num = 0
+        async for item in self:
+            if cond_f is None or await _call(cond_f, item):
+                num += 1
+        return num
+
+    async def any(self, cond_f=None):
+        """
+        If there exists item such that ``cond_f(item)``, return ``True``.
+        Else return ``False``.
+        """
+        async for item in self:
+            if await _call(cond_f, item) in (True,):
+                return True
+        return False
+
+    async def all(self, cond_f):
+        """
+        if all of ``cond_f(item)`` is ``True``, return ``True``.
+        Else return ``False``.
+        """
+        async for item in self:
+            if await _call(cond_f, item) in (False,):
+                return False
+        return True
+
+    async def sum(self, key_f=None):
+        """
+        Return total of ``key_f(item)``.
+        """
+        total = 0
+        async for item in self:
+            total += await _call(key_f, item)
+        return total
+
+    async def average(self, select_f=None):
+        """
+        Return average of ``select_f(item)``.
+        """
+        return (await self.stats(select_f)).mean
+
+    async def stats(self, key_f=None):
+        """
+        Return ``IStats`` of ``key_f(item)``.
+        """
+        stats = IStats()
+        async for item in self:
+            stats.add(await _call(key_f, item))
+        return stats
+
+    async def min(self, key_f=None):
+        """
+        Return minimal value in this query.
+        If this query is empty, ``IndexError`` is raised.
+        """
+        return await self._extreme(key_f, lambda x, y: x < y)
+
+    async def max(self, key_f=None):
+        """
+        Return maximal value in this query.
+        If this query is empty, ``IndexError`` is raised.
+        """
+        return await self._extreme(key_f, lambda x, y: x > y)
+
+    async def _extreme(self, key_f, better_f):
+        best = best_key = _EMPTY
+        async for item in self:
+            key = await _call(key_f, item)
+            if best is _EMPTY or better_f(key, best_key):
+                best, best_key = item, key
+        if best is _EMPTY:
+            # StopIteration can't be raised from coroutines (PEP 479)
+            raise IndexError('This linq is empty.')
+        return best
+
+    async def inject(self, initial_value, func, last_f=None):
+        """
+        Return the result of
+
+        func(func(func(initial_value, self[0]), self[1]) .. self[length - 1])
+
+        filtered by ``last_f``.
+        """
+        res = initial_value
+        async for item in self:
+            res = await _call(func, res, item)
+        return await _call(last_f, res)
+
+    async def group_by(self, grouping_f):
+        """
+        Group items by ``grouping_f`` and return ``IGroup``.
+        """
+        from ilinq.igroup import IPair, IGroup
+        group_dict = defaultdict(lambda: Linq([]))
+        async for item in self:
+            group_dict[await _call(grouping_f, item)].append(item)
+        return IGroup([IPair(*pair) for pair in group_dict.items()])
+
+    async def to_lookup(self, key_f=None, value_f=None):
+        """
+        Return the ``ILookup`` from ``key_f(item)`` to Linq object of some of
+        ``value_f(item)``.
+        """
+        from ilinq.ilookup import ILookup
+        d = defaultdict(lambda: Linq([]))
+        async for item in self:
+            d[await _call(key_f, item)].append(await _call(value_f, item))
+        return ILookup(d)
+
+    def __aiter__(self):
+        iterator = _aiter(self._source)
+        for gen_f, args in self._stages:
+            iterator = gen_f(iterator, *args)
+        return iterator
+
+    def __str__(self):
+        return '{}<...>'.format(self.__class__.__name__)
+
+    def __repr__(self):
+        return str(self)
+
+
+_EMPTY = object()
+
+
+async def _call(func, *args):
+    # ``None`` means the identity function of the last argument
+    if func is None:
+        return args[-1]
+    res = func(*args)
+    if inspect.isawaitable(res):
+        res = await res
+    return res
+
+
+def _aiter(iterable):
+    if hasattr(iterable, '__aiter__'):
+        return iterable.__aiter__()
+    return _from_iterable(iterable)
+
+
+async def _from_iterable(iterable):
+    for item in iterable:
+        yield item
+
+
+async def _map(iterator, func, concurrency):
+    # await ``func(item)`` keeping the order of items
+    if concurrency <= 1:
+        async for item in iterator:
+            yield await _call(func, item)
+        return
+
+    tasks = deque()
+    try:
+        async for item in iterator:
+            tasks.append(asyncio.ensure_future(_call(func, item)))
+            if len(tasks) >= concurrency:
+                yield await tasks.popleft()
+        while len(tasks) > 0:
+            yield await tasks.popleft()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _where(iterator, cond_f, concurrency):
+    async def pair(item):
+        return (await _call(cond_f, item), item)
+
+    async for ok, item in _map(iterator, pair, concurrency):
+        if ok:
+            yield item
+
+
+async def _select(iterator, select_f, concurrency):
+    async for item in _map(iterator, select_f, concurrency):
+        yield item
+
+
+async def _flatten(iterator):
+    async for items in iterator:
+        async for item in _aiter(items):
+            yield item
+
+
+async def _take(iterator, num):
+    if num <= 0:
+        return
+    count = 0
+    async for item in iterator:
+        yield item
+        count += 1
+        if count >= num:
+            return
+
+
+async def _take_while(iterator, cond_f):
+    async for item in iterator:
+        if not await _call(cond_f, item):
+            return
+        yield item
+
+
+async def _skip(iterator, num):
+    count = 0
+    async for item in iterator:
+        if count < num:
+            count += 1
+            continue
+        yield item
+    if count < num:
+        raise IndexError('AsyncLinq: this query is so short.')
+
+
+async def _skip_while(iterator, cond_f):
+    skipping = True
+    async for item in iterator:
+        if skipping and await _call(cond_f, item):
+            continue
+        skipping = False
+        yield item
+
+
+async def _distinct(iterator, key_f):
+    keys = IProbe()
+    async for item in iterator:
+        if keys.add(await _call(key_f, item)):
+            yield item
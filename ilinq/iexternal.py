@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides helpers to process items larger than memory by
+spilling them to temporary files.
+"""
+
+from collections import defaultdict
+import heapq
+import itertools
+import operator
+import pickle
+import tempfile
+from ilinq.ilinq import Linq, _act, _join, _order_key
+
+
+# The number of items which are pickled at once.
+_BLOCK_SIZE = 1024
+# The number of items in memory if only ``spill_dir`` is given.
+_MEMORY_LIMIT = 100000
+# The number of runs which are merged at once.
+_MAX_RUNS = 128
+# The number of partitions if only ``spill_dir`` is given.
+_PARTITIONS = 64
+
+
+class _Spill(object):
+    """
+    Temporary file of items, which are pickled in blocks of
+    ``_BLOCK_SIZE`` items.  The file is deleted when it is closed.
+    """
+    def __init__(self, spill_dir=None):
+        self._file = tempfile.TemporaryFile(dir=spill_dir)
+        self._block = list()
+
+    def append(self, item):
+        self._block.append(item)
+        if len(self._block) >= _BLOCK_SIZE:
+            self._flush()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def _flush(self):
+        if len(self._block) > 0:
+            pickle.dump(self._block, self._file, pickle.HIGHEST_PROTOCOL)
+            self._block = list()
+
+    def __iter__(self):
+        self._flush()
+        self._file.seek(0)
+        while True:
+            try:
+                block = pickle.load(self._file)
+            except EOFError:
+                return
+            for item in block:
+                yield item
+
+    def close(self):
+        self._file.close()
+
+
+class _Reiterable(object):
+    """
+    Iterable which calls ``gen_f(*args)`` whenever it is iterated.
+    """
+    def __init__(self, gen_f, *args):
+        self._gen_f = gen_f
+        self._args = args
+
+    def __iter__(self):
+        return iter(self._gen_f(*self._args))
+
+
+def _check_positive(name, value):
+    if value is not None and value < 1:
+        raise ValueError('{} must be positive: {}'.format(name, value))
+
+
+def _external_sort(iterator, orders, memory_limit, spill_dir):
+    # sort runs of ``memory_limit`` items, spill them and merge them
+    order_key, reverse = _order_key([desc for _, desc in orders])
+    if order_key is None:
+        record_key = operator.itemgetter(0)
+    else:
+        def record_key(record):
+            return order_key(record[0])
+
+    def sorted_run(items):
+        records = [
+            (tuple(_act(key_f, item) for key_f, _ in orders), item)
+            for item in items]
+        return sorted(records, key=record_key, reverse=reverse)
+
+    def merge(runs):
+        return heapq.merge(*runs, key=record_key, reverse=reverse)
+
+    iterator = iter(iterator)
+    memory_limit = memory_limit or _MEMORY_LIMIT
+    run = sorted_run(itertools.islice(iterator, memory_limit))
+    if len(run) < memory_limit:
+        for _, item in run:
+            yield item
+        return
+
+    # ``levels[k]`` is the list of runs which are merged ``k`` times.
+    # When a level has ``_MAX_RUNS`` runs, they are merged into a run of
+    # the next level, so that every item is merged O(log(runs)) times.
+    levels = list()
+
+    def add_run(spill, level):
+        while True:
+            if len(levels) <= level:
+                levels.append(list())
+            levels[level].append(spill)
+            if len(levels[level]) < _MAX_RUNS:
+                return
+            spill = _Spill(spill_dir)
+            try:
+                spill.extend(merge(levels[level]))
+            except BaseException:
+                spill.close()
+                raise
+            for run_spill in levels[level]:
+                run_spill.close()
+            levels[level] = list()
+            level += 1
+
+    try:
+        while len(run) > 0:
+            spill = _Spill(spill_dir)
+            try:
+                spill.extend(run)
+            except BaseException:
+                spill.close()
+                raise
+            del run
+            add_run(spill, 0)
+            run = sorted_run(itertools.islice(iterator, memory_limit))
+        # runs of higher levels have earlier items, which keeps the sort
+        # stable
+        runs = [spill for level in reversed(levels) for spill in level]
+        for _, item in merge(runs):
+            yield item
+    finally:
+        for level in levels:
+            for spill in level:
+                spill.close()
+
+
+def _partition(items, key_f, value_f, partitions, spill_dir):
+    # spill ``(key_f(item), value_f(item))`` to the partition of the key
+    spills = [_Spill(spill_dir) for _ in range(partitions)]
+    try:
+        for item in items:
+            key = _act(key_f, item)
+            spills[hash(key) % partitions].append((key, _act(value_f, item)))
+    except BaseException:
+        for spill in spills:
+            spill.close()
+        raise
+    return spills
+
+
+def _grouped_partitions(items, key_f, value_f, partitions, spill_dir):
+    # group the items of each partition in turn
+    spills = _partition(items, key_f, value_f, partitions, spill_dir)
+    try:
+        for spill in spills:
+            groups = defaultdict(lambda: Linq([]))
+            for key, value in spill:
+                groups[key].append(value)
+            spill.close()
+            for pair in groups.items():
+                yield pair
+            del groups
+    finally:
+        for spill in spills:
+            spill.close()
+
+
+def _spilled_groups(items, key_f, value_f, spill_dir, partitions):
+    """
+    Return the re-iterable of ``(key_f(item), Linq of value_f(item))``,
+    which hash-partitions ``items`` to ``partitions`` temporary files in
+    ``spill_dir`` and groups one partition at a time when it is iterated.
+    """
+    _check_positive('partitions', partitions)
+    return _Reiterable(
+        _grouped_partitions, items, key_f, value_f,
+        partitions or _PARTITIONS, spill_dir)
+
+
+def _joined_partitions(outers, inners, key_f, val_f, select_f, partitions,
+                       spill_dir):
+    # join the pairs of partitions which have the same hashes of keys
+    outer_spills = _partition(outers, key_f, None, partitions, spill_dir)
+    try:
+        inner_spills = _partition(inners, val_f, None, partitions, spill_dir)
+    except BaseException:
+        for spill in outer_spills:
+            spill.close()
+        raise
+    key = operator.itemgetter(0)
+    try:
+        for outer_spill, inner_spill in zip(outer_spills, inner_spills):
+            for res in _join(
+                    outer_spill, inner_spill, key, key,
+                    lambda outer, inner: select_f(outer[1], inner[1])):
+                yield res
+            outer_spill.close()
+            inner_spill.close()
+    finally:
+        for spill in outer_spills + inner_spills:
+            spill.close()
+
+
+def _spilled_join(outers, inners, key_f, val_f, select_f, spill_dir,
+                  partitions):
+    """
+    Return the re-iterable of the inner join of ``outers`` and ``inners``,
+    which hash-partitions both sides to ``partitions`` temporary files in
+    ``spill_dir`` and joins one pair of partitions at a time when it is
+    iterated.
+    """
+    _check_positive('partitions', partitions)
+    return _Reiterable(
+        _joined_partitions, outers, inners, key_f, val_f, select_f,
+        partitions or _PARTITIONS, spill_dir)
@@ -5,6 +5,7 @@
 This module provides grouped objects.
 """
 
+from ilinq.ilazy import LazyLinq, _select
 from ilinq.ilinq import Linq
 
 
@@ -52,15 +53,15 @@ class IGroup(Linq):
         if pairs is None:
             pairs = list()
 
-        for pair in pairs:
+        super().__init__(pairs)
+
+        keys = set()
+        for pair in self:
             if not isinstance(pair, IPair):
                 raise ValueError('{} is not a IPair instance.')
-
-        keys = list(map(lambda x: x.key, pairs))
-        if len(keys) != len(set(keys)):
-            raise ValueError('{} has overlap.')
-
-        super().__init__(pairs)
+            if pair.key in keys:
+                raise ValueError('{} has overlap.')
+            keys.add(pair.key)
 
     @property
     def keys(self):
@@ -75,3 +76,40 @@ class IGroup(Linq):
         return all value objects.
         """
         return [pair.values for pair in self]
+
+
+class LazyIGroup(LazyLinq):
+    """
+    Streaming ``IGroup``, which yields ``IPair`` objects one by one.
+    This object is returned by
+    `ilinq.Linq.group_by <ilinq.html#ilinq.ilinq.Linq.group_by>`_
+    with ``spill_dir`` or ``partitions``, so that groups can be aggregated
+    without holding all of them in memory.
+
+    ``pairs`` is a re-iterable of ``(key, Linq of values)``.
+
+    >>> group = Linq(range(10)).group_by(lambda n: n % 3, partitions=2)
+    >>> group.select(lambda pair: (pair.key, pair.values.sum())) \\
+    ...     .order_by().to_list()
+    [(0, 18), (1, 12), (2, 15)]
+    """
+    def __init__(self, pairs=None):
+        super().__init__(pairs, ((_select, (_to_ipair,)),))
+
+    @property
+    def keys(self):
+        """
+        return ``LazyLinq`` of all key objects.
+        """
+        return self.select(lambda pair: pair.key)
+
+    @property
+    def values(self):
+        """
+        return ``LazyLinq`` of all value objects.
+        """
+        return self.select(lambda pair: pair.values)
+
+
+def _to_ipair(pair):
+    return IPair(*pair)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides helpers to stream records from files and to write
+them to files, which are used for ``Linq.from_lines``, ``Linq.from_csv``,
+``Linq.from_jsonl``, ``Linq.to_csv``, ``Linq.to_jsonl`` and
+``Linq.to_sqlite``, and ``IWriteResult`` object.
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import json
+import lzma
+import os
+import sqlite3
+import time
+
+
+# The buffer size of reading and writing files.
+_BUFFER_SIZE = 1 << 20
+# The number of rows which are inserted by one ``executemany``.
+_BATCH_SIZE = 10000
+_OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+_SUFFIXES = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+}
+_EMPTY = object()
+
+
+class IWriteResult(object):
+    """
+    Result of writing items to a file or a table, which is returned by
+    `ilinq.Linq.to_csv <ilinq.html#ilinq.ilinq.Linq.to_csv>`_,
+    `ilinq.Linq.to_jsonl <ilinq.html#ilinq.ilinq.Linq.to_jsonl>`_ and
+    `ilinq.Linq.to_sqlite <ilinq.html#ilinq.ilinq.Linq.to_sqlite>`_.
+
+    >>> result = IWriteResult(1000, 0.5)
+    >>> result.rows, result.seconds, result.rows_per_second
+    (1000, 0.5, 2000.0)
+    """
+    def __init__(self, rows, seconds):
+        self._rows = rows
+        self._seconds = seconds
+
+    @property
+    def rows(self):
+        """
+        return the number of written rows.
+        """
+        return self._rows
+
+    @property
+    def seconds(self):
+        """
+        return elapsed seconds of writing.
+        """
+        return self._seconds
+
+    @property
+    def rows_per_second(self):
+        """
+        return the number of written rows per second.
+        """
+        if self._seconds <= 0:
+            return float('inf') if self._rows > 0 else 0.0
+        return self._rows / self._seconds
+
+    def __str__(self):
+        return '{}<rows: {}, seconds: {}, rows_per_second: {}>'.format(
+            self.__class__.__name__, self.rows, self.seconds,
+            self.rows_per_second)
+
+    def __repr__(self):
+        return str(self)
+
+
+def _compression(path, compression):
+    # ``None`` means the compression inferred from the suffix of ``path``
+    if compression is None:
+        return _SUFFIXES.get(os.path.splitext(str(path))[1].lower())
+    if compression not in _OPENERS:
+        raise ValueError('unknown compression: {}'.format(compression))
+    return compression
+
+
+def _read_lines(path, encoding, compression):
+    # yield lines with line endings, which are split at '\n', '\r' and
+    # '\r\n' for any compression
+    compression = _compression(path, compression)
+    if compression is not None:
+        raw = _OPENERS[compression](path, 'rb')
+        with io.TextIOWrapper(raw, encoding=encoding, newline='') as f:
+            for line in f:
+                yield line
+        return
+
+    with open(path, encoding=encoding, newline='',
+              buffering=_BUFFER_SIZE) as f:
+        for line in f:
+            yield line
+
+
+def _lines(path, encoding, compression):
+    for line in _read_lines(path, encoding, compression):
+        yield line.rstrip('\r\n')
+
+
+def _csv_rows(path, header, encoding, compression, fmtparams):
+    lines = _read_lines(path, encoding, compression)
+    if header:
+        for row in csv.DictReader(lines, **fmtparams):
+            yield row
+    else:
+        for row in csv.reader(lines, **fmtparams):
+            yield tuple(row)
+
+
+def _jsonl_records(path, encoding, compression):
+    for line in _read_lines(path, encoding, compression):
+        if line.strip():
+            yield json.loads(line)
+
+
+def _open_writer(path, encoding, compression):
+    compression = _compression(path, compression)
+    if compression is None:
+        return open(path, 'w', encoding=encoding, newline='',
+                    buffering=_BUFFER_SIZE)
+    raw = io.BufferedWriter(
+        _OPENERS[compression](path, 'wb'), buffer_size=_BUFFER_SIZE)
+    return io.TextIOWrapper(raw, encoding=encoding, newline='')
+
+
+def _write_csv(items, path, header, encoding, compression, fmtparams):
+    start = time.perf_counter()
+    rows = 0
+    iterator = iter(items)
+    first = next(iterator, _EMPTY)
+    with _open_writer(path, encoding, compression) as f:
+        if isinstance(first, dict):
+            names = list(first) if header in (True, False) else header
+            writer = csv.DictWriter(f, names, **fmtparams)
+            if header is not False:
+                writer.writeheader()
+        else:
+            writer = csv.writer(f, **fmtparams)
+            if header not in (True, False):
+                writer.writerow(header)
+        if first is not _EMPTY:
+            writer.writerow(first)
+            rows = 1
+            for row in iterator:
+                writer.writerow(row)
+                rows += 1
+    return IWriteResult(rows, time.perf_counter() - start)
+
+
+def _write_jsonl(items, path, encoding, compression):
+    start = time.perf_counter()
+    rows = 0
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with _open_writer(path, encoding, compression) as f:
+        for item in items:
+            f.write(dumps(item))
+            f.write('\n')
+            rows += 1
+    return IWriteResult(rows, time.perf_counter() - start)
+
+
+def _quote(name):
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+def _write_sqlite(items, database, table, columns, batch_size):
+    start = time.perf_counter()
+    iterator = iter(items)
+    first = next(iterator, _EMPTY)
+    if first is _EMPTY:
+        return IWriteResult(0, time.perf_counter() - start)
+
+    if isinstance(first, dict):
+        columns = list(first) if columns is None else list(columns)
+        iterator = itertools.chain([first], iterator)
+        records = (tuple(item[column] for column in columns)
+                   for item in iterator)
+        num = len(columns)
+    else:
+        records = itertools.chain([tuple(first)], (
+            tuple(item) for item in iterator))
+        num = len(first)
+    sql = 'INSERT INTO {}{} VALUES ({})'.format(
+        _quote(table),
+        '' if columns is None else ' ({})'.format(
+            ', '.join(map(_quote, columns))),
+        ', '.join('?' * num))
+
+    conn = database if isinstance(database, sqlite3.Connection) \
+        else sqlite3.connect(database)
+    rows = 0
+    try:
+        with conn:
+            if columns is not None:
+                conn.execute('CREATE TABLE IF NOT EXISTS {} ({})'.format(
+                    _quote(table), ', '.join(map(_quote, columns))))
+            while True:
+                batch = list(itertools.islice(
+                    records, batch_size or _BATCH_SIZE))
+                if len(batch) == 0:
+                    break
+                conn.executemany(sql, batch)
+                rows += len(batch)
+    finally:
+        if conn is not database:
+            conn.close()
+    return IWriteResult(rows, time.perf_counter() - start)
@@ -0,0 +1,1127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides ``LazyLinq`` class, which defers the execution of
+``Linq`` operators until its items are needed.
+"""
+
+import itertools
+import operator
+from ilinq.ilinq import (
+    Linq, _act, _as_probe, _extremes, _first_index, _order_key,
+    _keys, _sorted_by, _take_matches,
+    _top as _top_items, _bottom as _bottom_items)
+from ilinq.iexternal import (
+    _check_positive, _external_sort, _spilled_groups, _spilled_join)
+from ilinq.iparallel import _select_list, _threaded_map, _where_pair
+from ilinq.iprobe import IProbe
+from ilinq.istats import IStats
+
+
+class LazyLinq(object):
+    """
+    Class for handling Linq like C# with deferred execution.
+
+    Every operator appends a stage to the query and returns a new
+    ``LazyLinq``.  Items stream through the stages one by one only when
+    this object is iterated, converted by ``to_list`` and so on, or
+    aggregated.
+
+    >>> query = Linq(range(10)).lazy().where(lambda n: n % 2 == 0)
+    >>> query.select(lambda n: n * n).to_list()
+    [0, 4, 16, 36, 64]
+
+    Runs of ``where``, ``select``, ``select_i``, ``take``, ``take_while`` and
+    ``skip`` are fused into one generated loop when this query is executed.
+
+    Note that if ``source`` is an iterator, this object can be iterated
+    only once.
+    """
+    def __init__(self, source=None, stages=()):
+        if source is None:
+            source = list()
+        self._source = source
+        self._stages = tuple(stages)
+
+    def _then(self, gen_f, *args):
+        return LazyLinq(self._source, self._stages + ((gen_f, args),))
+
+    def where(self, cond_f=None):
+        """
+        Return the LazyLinq instance filtered by ``cond_f``.
+
+        >>> Linq(range(10 + 1)).lazy().where(lambda n: n % 5 == 0).to_list()
+        [0, 5, 10]
+        """
+        return self._then(_where, cond_f)
+
+    def where_in(self, list_, key_f=None):
+        """
+        Return items which the condition that ``key_f(item)`` in ``list_``.
+
+        >>> Linq([1, 3, 5, 100]).lazy().where_in([1, 2, 3]).to_list()
+        [1, 3]
+        """
+        probe = _as_probe(list_)
+        return self.where(lambda x: _act(key_f, x) in probe)
+
+    def select(self, select_f=None):
+        """
+        Return the LazyLinq instance selected by ``select_f``.
+
+        >>> Linq(range(5)).lazy().select(lambda n: n % 3).to_list()
+        [0, 1, 2, 0, 1]
+        """
+        return self._then(_select, select_f)
+
+    def select_i(self, select_f=None):
+        """
+        Return the LazyLinq instance selected by ``select_f`` with index
+        parameter.
+
+        >>> Linq([4, 3, 2]).lazy().select_i(lambda i, x: x ** i).to_list()
+        [1, 3, 4]
+        """
+        return self._then(_select_i, select_f)
+
+    def select_many(self, select_f=None):
+        """
+        Return the LazyLinq instance selected by ``select_f`` and flatten.
+
+        >>> Linq([[1, 2], [3]]).lazy().select_many().to_list()
+        [1, 2, 3]
+        """
+        return self._then(_select_many, select_f)
+
+    def select_many_i(self, select_f=None):
+        """
+        Return selected flatten LazyLinq by ``select_f`` with index parameter.
+
+        >>> Linq([[9, 8], [7]]).lazy().select_many_i(lambda i, x: i + x) \\
+        ...     .to_list()
+        [9, 9, 9]
+        """
+        return self.select_many().select_i(select_f)
+
+    def where_threaded(self, cond_f, max_workers=None, ordered=True):
+        """
+        Return the LazyLinq filtered by ``cond_f``, which is called in
+        ``max_workers`` threads.  See ``Linq.where_threaded``.
+        """
+        return self._then(_where_threaded, cond_f, max_workers, ordered)
+
+    def select_threaded(self, select_f, max_workers=None, ordered=True):
+        """
+        Return the LazyLinq selected by ``select_f``, which is called in
+        ``max_workers`` threads.  See ``Linq.select_threaded``.
+
+        >>> Linq(range(5)).lazy().select_threaded(lambda n: n * n).to_list()
+        [0, 1, 4, 9, 16]
+        """
+        return self._then(_select_threaded, select_f, max_workers, ordered)
+
+    def select_many_threaded(self, select_f, max_workers=None, ordered=True):
+        """
+        Return the LazyLinq selected by ``select_f`` and flatten.
+        ``select_f`` is called in ``max_workers`` threads.
+        """
+        return self._then(
+            _select_many_threaded, select_f, max_workers, ordered)
+
+    def take(self, num):
+        """
+        Return first ``num`` items of this query.
+
+        >>> Linq(range(10)).lazy().take(4).to_list()
+        [0, 1, 2, 3]
+        """
+        return self._then(_take, num)
+
+    def take_while(self, cond_f=None):
+        """
+        Return first some items such that ``cond_f(item)``.
+
+        >>> Linq(range(10)).lazy().take_while(lambda x: x < 5).to_list()
+        [0, 1, 2, 3, 4]
+        """
+        return self._then(_take_while, cond_f)
+
+    def take_while_i(self, cond_f=None):
+        """
+        Return first some items such that ``cond_f(index, item)``.
+
+        >>> Linq([0, 1, 2, 3, 9]).lazy().take_while_i(
+        ...     lambda i, x: i * x <= 10).to_list()
+        [0, 1, 2, 3]
+        """
+        return self._then(_take_while_i, cond_f)
+
+    def skip(self, num):
+        """
+        Return the LazyLinq skipped first ``num`` items.
+        If this query is shorter than ``num``, ``IndexError`` is raised when
+        it is executed.
+
+        >>> Linq(range(5)).lazy().skip(3).to_list()
+        [3, 4]
+        """
+        return self._then(_skip, num)
+
+    def skip_while(self, cond_f=None):
+        """
+        Return the LazyLinq skipped first some items such that
+        ``cond_f(item)``.
+
+        >>> Linq([5, 4, 100, 2]).lazy().skip_while(lambda x: x < 50).to_list()
+        [100, 2]
+        """
+        return self._then(_skip_while, cond_f)
+
+    def skip_while_i(self, cond_f=None):
+        """
+        Return the LazyLinq skipped first some items such that
+        ``cond_f(index, item)``.
+
+        >>> Linq(range(10)).lazy().skip_while_i(lambda i, x: i * x < 10) \\
+        ...     .to_list()
+        [4, 5, 6, 7, 8, 9]
+        """
+        return self._then(_skip_while_i, cond_f)
+
+    def concat(self, *linqs):
+        """
+        Return the LazyLinq which yields items of ``self`` and ``linqs``.
+
+        >>> Linq(range(2)).lazy().concat([5], Linq([6, 7])).to_list()
+        [0, 1, 5, 6, 7]
+        """
+        return self._then(_concat, linqs)
+
+    def default_if_empty(self, default=None):
+        """
+        if ``self`` is empty, yield ``default`` only.
+
+        >>> Linq([]).lazy().default_if_empty("default").to_list()
+        ['default']
+        """
+        return self._then(_default_if_empty, default)
+
+    def distinct(self, key_f=None):
+        """
+        Return the LazyLinq deleted duplicates.
+
+        >>> Linq([1, 2, 1, 3, 2]).lazy().distinct().to_list()
+        [1, 2, 3]
+        """
+        return self._then(_distinct, key_f)
+
+    def except_(self, other, key_f=None):
+        """
+        Return the LazyLinq of ``self`` items except for ``other`` items by
+        ``key_f``. See ``Linq.except_``.
+
+        >>> Linq(range(6)).lazy().except_([1, 3, 8]).to_list()
+        [0, 2, 4, 5]
+        """
+        return self._then(_except, other, key_f)
+
+    def intersect(self, other, key_f=None):
+        """
+        Return the LazyLinq of the intersection set of ``self`` and
+        ``other`` by ``key_f``. See ``Linq.intersect``.
+
+        >>> Linq([2, 1, 2, 3]).lazy().intersect([3, 2]).to_list()
+        [2, 3]
+        """
+        return self._then(_intersect, other, key_f)
+
+    def union(self, other, key_f=None):
+        """
+        Return the LazyLinq of the union set of ``self`` and ``other`` by
+        ``key_f``. See ``Linq.union``.
+
+        >>> Linq([1, 2, 2, 3]).lazy().union([3, 4, 4]).to_list()
+        [1, 2, 3, 4]
+        """
+        return self._then(_union, other, key_f)
+
+    def zip(self, other, zip_f=None):
+        """
+        collect ``self`` items and ``other`` items by ``zip_f``.
+
+        >>> Linq([1, 2, 3]).lazy().zip([4, 5]).to_list()
+        [(1, 4), (2, 5)]
+        """
+        return self._then(_zip, other, zip_f)
+
+    def reverse(self):
+        """
+        Return reversed LazyLinq object.
+
+        >>> Linq(range(4)).lazy().reverse().to_list()
+        [3, 2, 1, 0]
+        """
+        return self._then(_reverse)
+
+    def order_by(self, key_f=None, desc=False, spill_dir=None,
+                 memory_limit=None):
+        """
+        Return the ``OrderedLazyLinq`` sorted by ``key_f``.
+        All items are loaded when this query is executed.
+
+        >>> Linq([1.1, 2.3, -2]).lazy().order_by(desc=True).to_list()
+        [2.3, 1.1, -2]
+
+        If ``spill_dir`` or ``memory_limit`` is given, the items are sorted
+        by an external merge sort: runs of ``memory_limit`` items are sorted,
+        pickled to temporary files in ``spill_dir`` and merged when this
+        query is executed, so that items larger than memory can be sorted.
+
+        >>> Linq([3, 1, 4, 1, 5]).lazy().order_by(memory_limit=2).to_list()
+        [1, 1, 3, 4, 5]
+        """
+        return OrderedLazyLinq(
+            self._source, self._stages, ((key_f, desc),),
+            spill_dir, memory_limit)
+
+    def top(self, num, key_f=None, desc=False):
+        """
+        Return first ``num`` items of ``self.order_by(key_f, desc)`` selected
+        by a heap.
+
+        >>> Linq([5, 1, 4, 2, 3]).lazy().top(2, desc=True).to_list()
+        [5, 4]
+        """
+        return self._then(_top, num, key_f, desc)
+
+    def bottom(self, num, key_f=None, desc=False):
+        """
+        Return last ``num`` items of ``self.order_by(key_f, desc)`` selected
+        by a heap.
+
+        >>> Linq([5, 1, 4, 2, 3]).lazy().bottom(2).to_list()
+        [4, 5]
+        """
+        return self._then(_bottom, num, key_f, desc)
+
+    def scan(self, initial_value, func):
+        """
+        yield successive reduced values from the left.
+
+        >>> Linq(range(1, 4 + 1)).lazy().scan(0, lambda r, v: r - v).to_list()
+        [0, -1, -3, -6, -10]
+        """
+        return self._then(_scan, initial_value, func)
+
+    def inject(self, initial_value, func, last_f=None):
+        """
+        Return the result of
+
+        func(func(func(initial_value, self[0]), self[1]) .. self[length - 1])
+
+        filtered by ``last_f``.
+
+        >>> Linq(range(100 + 1)).lazy().inject(0, lambda res, x: res + x)
+        5050
+        """
+        res = initial_value
+        for item in self:
+            res = func(res, item)
+        return _act(last_f, res)
+
+    def count(self, cond_f=None):
+        """
+        Return the number of items with condition that ``cond_f(item)``.
+
+        >>> Linq(range(10)).lazy().count(lambda x: x >= 8)
+        2
+        """
+        return sum(1 for item in self if cond_f is None or cond_f(item))
+
+    def first(self, cond_f=None):
+        """
+        Return the first element with ``cond_f(item)``.
+
+        >>> Linq([3, 2, 5, 8]).lazy().first(cond_f=lambda x: x % 2 == 0)
+        2
+        """
+        for item in self:
+            if cond_f is None or cond_f(item):
+                return item
+        raise IndexError('This linq with condition is Empty.')
+
+    def first_or_default(self, cond_f=None, default=None):
+        """
+        Return the first element with ``cond_f(item)`` and ``default`` value
+        is ``default``.
+
+        >>> Linq([3, 2, 5, 8]).lazy().first_or_default(lambda x: x > 100, 0)
+        0
+        """
+        for item in self:
+            if cond_f is None or cond_f(item):
+                return item
+        return default
+
+    def last(self, cond_f=None):
+        """
+        Return the last element with ``cond_f(item)``.
+
+        >>> Linq([3, 2, 5, 8]).lazy().last(lambda x: x % 4 == 1)
+        5
+        """
+        res = self.last_or_default(cond_f, _EMPTY)
+        if res is _EMPTY:
+            raise IndexError('This linq with condition is Empty.')
+        return res
+
+    def last_or_default(self, cond_f=None, default=None):
+        """
+        Return the last element with ``cond_f(item)`` and default value
+        is ``default``.
+
+        >>> Linq([3, 2, 5, 8]).lazy().last_or_default(lambda x: x > 100, -1)
+        -1
+        """
+        res = default
+        for item in self:
+            if cond_f is None or cond_f(item):
+                res = item
+        return res
+
+    def single(self, cond_f=None):
+        """
+        If this query yields one object, return this object.
+        Otherwise, error is occured.
+
+        >>> Linq([12]).lazy().single()
+        12
+        """
+        items = _take_matches(self, cond_f, 2)
+        if len(items) == 0:
+            raise IndexError('This linq with condition is empty.')
+        elif len(items) == 2:
+            raise IndexError('This linq with condition is more long.')
+        return items[0]
+
+    def single_or_default(self, default=None, cond_f=None):
+        """
+        If this query yields only one object, return this object.
+        If this query is empty, return ``default``.
+
+        >>> Linq([]).lazy().single_or_default(16)
+        16
+        """
+        items = _take_matches(self, cond_f, 2)
+        if len(items) == 0:
+            return default
+        elif len(items) == 2:
+            raise IndexError('This linq with condition is more long.')
+        return items[0]
+
+    def element_at(self, ind):
+        """
+        Return the element at ``ind`` index.
+
+        >>> Linq([3, 2, 5, 8]).lazy().element_at(2)
+        5
+        """
+        if ind >= 0:
+            for item in itertools.islice(self, ind, ind + 1):
+                return item
+        raise IndexError("This linq doesn't have {} items.".format(ind))
+
+    def element_at_or_default(self, num, default=None):
+        """
+        If there is ``num``-th element, return this.
+        Else return ``default`` value.
+
+        >>> Linq([1, 2]).lazy().element_at_or_default(3, 0)
+        0
+        """
+        try:
+            return self.element_at(num)
+        except IndexError:
+            return default
+
+    def contains(self, item, key_f=None):
+        """
+        Return either ``item`` is in ``self`` or not.
+
+        >>> Linq([1, 2, 3]).lazy().contains(101, key_f=lambda n: n % 100)
+        True
+        """
+        value = _act(key_f, item)
+        return value in (self if key_f is None else map(key_f, self))
+
+    def all(self, cond_f):
+        """
+        if all of ``cond_f(item)`` is ``True``, return ``True``.
+        Else return ``False``.
+
+        >>> Linq([14, 28, 35]).lazy().all(lambda n: n % 7 == 0)
+        True
+        """
+        return False not in (_act(cond_f, item) for item in self)
+
+    def any(self, cond_f=None):
+        """
+        If there exists item such that ``cond_f(item)``, return ``True``.
+        Else return ``False``.
+
+        >>> Linq([1, 2, 3]).lazy().any(lambda n: n == 3)
+        True
+        """
+        return True in (_act(cond_f, item) for item in self)
+
+    def min(self, key_f=None):
+        """
+        Return minimal value in this query.
+
+        >>> Linq([-1, 2, 3, -4.3, 2]).lazy().min(abs)
+        -1
+        """
+        try:
+            return min(self, key=lambda x: _act(key_f, x))
+        except ValueError:
+            raise StopIteration('This linq is empty.')
+
+    def max(self, key_f=None):
+        """
+        Return maximal value in this query.
+
+        >>> Linq([-1, 2, 3, -4.3, 2]).lazy().max(abs)
+        -4.3
+        """
+        try:
+            return max(self, key=lambda x: _act(key_f, x))
+        except ValueError:
+            raise StopIteration('This linq is empty.')
+
+    def min_all(self, key_f=None):
+        """
+        Return the Linq object which consists of minimal items computed by
+        ``key_f``.
+
+        >>> Linq([0, 1, 0]).lazy().min_all()
+        Linq<0, 0>
+        """
+        return Linq([item for _, item in _extremes(self, key_f, operator.lt)])
+
+    def argmin(self, key_f=None):
+        """
+        Return the first index of minimal value computed by ``key_f``.
+
+        >>> Linq([3, -4, 2, -4]).lazy().argmin()
+        1
+        """
+        return _first_index(_extremes(self, key_f, operator.lt))
+
+    def max_all(self, key_f=None):
+        """
+        Return the Linq object which consists of maximal items computed by
+        ``key_f``.
+
+        >>> Linq([0, 1, 1]).lazy().max_all()
+        Linq<1, 1>
+        """
+        return Linq([item for _, item in _extremes(self, key_f, operator.gt)])
+
+    def argmax(self, key_f=None):
+        """
+        Return the first index of maximal value computed by ``key_f``.
+
+        >>> Linq([3, -4, 2, -4]).lazy().argmax(abs)
+        1
+        """
+        return _first_index(_extremes(self, key_f, operator.gt))
+
+    def sum(self, key_f=None):
+        """
+        Return total of ``key_f(item)``.
+
+        >>> Linq(range(100 + 1)).lazy().sum()
+        5050
+        """
+        return sum(_act(key_f, item) for item in self)
+
+    def average(self, select_f=None):
+        """
+        Return average of ``select_f(item)``.
+
+        >>> Linq([1, 2, 3, 4, 5]).lazy().average()
+        3.0
+        """
+        return self.stats(select_f).mean
+
+    def std(self, key_f=None):
+        """
+        Return standard deviation
+        """
+        return self.stats(key_f).std
+
+    def stats(self, key_f=None):
+        """
+        Return ``IStats`` of ``key_f(item)`` computed by one scan.
+
+        >>> Linq([1, 2, 3]).lazy().stats().variance
+        0.6666666666666666
+        """
+        return IStats(_act(key_f, item) for item in self)
+
+    def join(self, other, key_f, val_f, select_f, spill_dir=None,
+             partitions=None):
+        """
+        inner join ``self`` and ``other`` by ``key_f``, ``val_f`` and
+        ``select_f``. See ``Linq.join``.
+        If ``spill_dir`` or ``partitions`` is given, the LazyLinq joined by
+        Grace hash join is returned without loading all items.
+        """
+        if spill_dir is not None or partitions is not None:
+            return LazyLinq(_spilled_join(
+                self, other, key_f, val_f, select_f, spill_dir, partitions))
+        return self.to_linq().join(other, key_f, val_f, select_f)
+
+    def group_join(self, other, key_f, value_f, select_f):
+        """
+        Grouping by ``key_f``, ``value_f`` and ``select_f``.
+        See ``Linq.group_join``.
+        """
+        return self.to_linq().group_join(other, key_f, value_f, select_f)
+
+    def group_by(self, grouping_f, spill_dir=None, partitions=None):
+        """
+        Group items by ``grouping_f``. See ``Linq.group_by``.
+        If ``spill_dir`` or ``partitions`` is given, the streaming
+        ``LazyIGroup`` is returned without loading all items.
+        """
+        if spill_dir is not None or partitions is not None:
+            from ilinq.igroup import LazyIGroup
+            return LazyIGroup(_spilled_groups(
+                self, grouping_f, None, spill_dir, partitions))
+        return self.to_linq().group_by(grouping_f)
+
+    def to_lookup(self, key_f=None, value_f=None, spill_dir=None,
+                  partitions=None):
+        """
+        Return the ``ILookup`` from ``key_f(item)`` to Linq object of some of
+        ``value_f(item)``. See ``Linq.to_lookup``.
+        If ``spill_dir`` or ``partitions`` is given, the streaming
+        ``LazyILookup`` is returned without loading all items.
+        """
+        if spill_dir is not None or partitions is not None:
+            from ilinq.ilookup import LazyILookup
+            return LazyILookup(_spilled_groups(
+                self, key_f, value_f, spill_dir, partitions))
+        return self.to_linq().to_lookup(key_f, value_f)
+
+    def to_linq(self):
+        """
+        Execute this query and return the ``Linq`` of the result items.
+
+        >>> Linq(range(3)).lazy().select(lambda n: n * 2).to_linq()
+        Linq<0, 2, 4>
+        """
+        return Linq(self)
+
+    def to_list(self):
+        """
+        Execute this query and return the list of result items.
+        """
+        return list(self)
+
+    def to_csv(self, path, header=True, encoding='utf-8', compression=None,
+               **fmtparams):
+        """
+        Write the result items to the CSV file ``path`` one by one and
+        return ``IWriteResult``. See ``Linq.to_csv``.
+        """
+        from ilinq.iio import _write_csv
+        return _write_csv(self, path, header, encoding, compression, fmtparams)
+
+    def to_jsonl(self, path, encoding='utf-8', compression=None):
+        """
+        Write the result items to the JSON Lines file ``path`` one by one
+        and return ``IWriteResult``. See ``Linq.to_jsonl``.
+        """
+        from ilinq.iio import _write_jsonl
+        return _write_jsonl(self, path, encoding, compression)
+
+    def to_sqlite(self, database, table, columns=None, batch_size=None):
+        """
+        Insert the result items to ``table`` of the SQLite ``database`` in
+        batches and return ``IWriteResult``. See ``Linq.to_sqlite``.
+        """
+        from ilinq.iio import _write_sqlite
+        return _write_sqlite(self, database, table, columns, batch_size)
+
+    def to_set(self):
+        """
+        Execute this query and return the set of result items.
+        """
+        return set(self)
+
+    def to_dict(self, key_f=None, value_f=None):
+        """
+        Return dictionary consisted of ``[key_f(item), value_f(item)]``.
+        See ``Linq.to_dict``.
+        """
+        return self.to_linq().to_dict(key_f, value_f)
+
+    def assume_sorted(self, key_f=None, desc=False):
+        """
+        Return the ``SortedLazyLinq`` which assumes that the items are
+        sorted by ``key_f``.
+        The items are not checked.
+
+        >>> Linq([1, 1, 2, 3, 3]).lazy().assume_sorted().distinct().to_list()
+        [1, 2, 3]
+        """
+        return SortedLazyLinq(self._source, self._stages, key_f, desc)
+
+    def lazy(self):
+        """
+        Return ``self``.
+        """
+        return self
+
+    def __iter__(self):
+        iterator = iter(self._source)
+        for gen_f, args in _fuse(self._stages):
+            iterator = gen_f(iterator, *args)
+        return iterator
+
+    def __str__(self):
+        return '{}<...>'.format(self.__class__.__name__)
+
+    def __repr__(self):
+        return str(self)
+
+
+class OrderedLazyLinq(LazyLinq):
+    """
+    LazyLinq sorted by ``order_by``, which can be sorted by more keys by
+    ``then_by`` and ``then_by_descending`` like ``OrderedLinq``.
+    If ``take`` follows, the items are selected by a heap in
+    O(n log k) time and O(k) memory instead of sorting all items.
+
+    >>> Linq(range(10 ** 6)).lazy().order_by(desc=True).take(3).to_list()
+    [999999, 999998, 999997]
+    """
+    def __init__(self, source, stages, orders, spill_dir=None,
+                 memory_limit=None):
+        _check_positive('memory_limit', memory_limit)
+        if spill_dir is None and memory_limit is None:
+            stage = (_order_by, (orders,))
+        else:
+            stage = (_external_sort, (orders, memory_limit, spill_dir))
+        super().__init__(source, tuple(stages) + (stage,))
+        self._unordered = LazyLinq(source, stages)
+        self._orders = tuple(orders)
+        self._spill_dir = spill_dir
+        self._memory_limit = memory_limit
+
+    def then_by(self, key_f=None, desc=False):
+        """
+        Return the OrderedLazyLinq sorted by the previous keys and ``key_f``.
+
+        >>> Linq([(1, 'b'), (0, 'c'), (1, 'a')]).lazy() \\
+        ...     .order_by(lambda x: x[0]).then_by(lambda x: x[1]).to_list()
+        [(0, 'c'), (1, 'a'), (1, 'b')]
+        """
+        return OrderedLazyLinq(
+            self._unordered._source, self._unordered._stages,
+            self._orders + ((key_f, desc),),
+            self._spill_dir, self._memory_limit)
+
+    def then_by_descending(self, key_f=None):
+        """
+        Return the OrderedLazyLinq sorted by the previous keys and ``key_f``
+        in descending order.
+        """
+        return self.then_by(key_f, desc=True)
+
+    def take(self, num):
+        if len(self._orders) == 1:
+            key_f, desc = self._orders[0]
+            return self._unordered.top(num, key_f, desc)
+        order_key, desc = _order_key([desc for _, desc in self._orders])
+        return self._unordered.top(
+            num, lambda item: _act(order_key, _keys(item, self._orders)),
+            desc)
+
+
+class SortedLazyLinq(LazyLinq):
+    """
+    LazyLinq whose items are assumed to be sorted by ``key_f`` in
+    descending order if ``desc`` else ascending order.
+    This object is created by ``assume_sorted``.
+
+    ``join``, ``group_by`` and ``distinct`` stream the items and keep only
+    the items of the current key in memory.  If the items aren't sorted,
+    their results are wrong.
+
+    >>> Linq([(0, 'a'), (0, 'b'), (1, 'c')]).lazy() \\
+    ...     .assume_sorted(lambda x: x[0]) \\
+    ...     .group_by().select(lambda pair: pair.values.count()).to_list()
+    [2, 1]
+    """
+    def __init__(self, source, stages, key_f=None, desc=False):
+        super().__init__(source, stages)
+        self._key_f = key_f
+        self._desc = desc
+
+    def _sorted(self, query):
+        return SortedLazyLinq(
+            query._source, query._stages, self._key_f, self._desc)
+
+    def where(self, cond_f=None):
+        """
+        Return the SortedLazyLinq filtered by ``cond_f``.
+        """
+        return self._sorted(super().where(cond_f))
+
+    def take(self, num):
+        """
+        Return the SortedLazyLinq of first ``num`` items.
+        """
+        return self._sorted(super().take(num))
+
+    def skip(self, num):
+        """
+        Return the SortedLazyLinq skipped first ``num`` items.
+        """
+        return self._sorted(super().skip(num))
+
+    def distinct(self, key_f=None):
+        """
+        Return the SortedLazyLinq deleted duplicates of ``key_f(item)`` by
+        comparing with the key of the previous item.
+        If ``key_f`` is ``None``, the key of ``assume_sorted`` is used.
+        """
+        return self._sorted(
+            self._then(_distinct_sorted, key_f or self._key_f))
+
+    def group_by(self, grouping_f=None, spill_dir=None, partitions=None):
+        """
+        Group items by ``grouping_f`` and return ``LazyIGroup``, which
+        yields ``IPair`` as soon as the key changes.
+        If ``grouping_f`` is ``None``, the key of ``assume_sorted`` is used.
+        ``spill_dir`` and ``partitions`` are accepted like
+        ``LazyLinq.group_by`` and ignored, because nothing is spilled.
+        """
+        from ilinq.igroup import LazyIGroup
+        _check_positive('partitions', partitions)
+        return LazyIGroup(self._then(_group_runs, grouping_f or self._key_f))
+
+    def join(self, other, key_f=None, val_f=None, select_f=None,
+             spill_dir=None, partitions=None):
+        """
+        inner join ``self`` and ``other`` by merging them.
+        ``other`` must be sorted by ``val_f`` in the same order as ``self``.
+
+        If ``key_f`` is ``None``, the key of ``assume_sorted`` is used.
+        If ``val_f`` is ``None``, the key of ``other.assume_sorted`` or
+        ``key_f`` is used.  If ``select_f`` is ``None``, the pairs of items
+        are returned.  Only the items of ``other`` with the current key are
+        kept in memory, so ``spill_dir`` and ``partitions`` are accepted like
+        ``LazyLinq.join`` and ignored.
+
+        >>> Linq([1, 2, 2, 4]).lazy().assume_sorted() \\
+        ...     .join([2, 3, 4, 4]).to_list()
+        [(2, 2), (2, 2), (4, 4), (4, 4)]
+        """
+        _check_positive('partitions', partitions)
+        key_f = key_f or self._key_f
+        if val_f is None:
+            val_f = other._key_f if isinstance(other, SortedLazyLinq) \
+                else key_f
+        return self._then(
+            _merge_join, other, key_f, val_f, select_f, self._desc)
+
+
+_EMPTY = object()
+
+
+def _where(iterator, cond_f):
+    if cond_f is None:
+        return iterator
+    return (item for item in iterator if cond_f(item))
+
+
+def _select(iterator, select_f):
+    if select_f is None:
+        return iterator
+    return (select_f(item) for item in iterator)
+
+
+def _select_i(iterator, select_f):
+    if select_f is None:
+        return iterator
+    return (select_f(i, item) for i, item in enumerate(iterator))
+
+
+def _select_many(iterator, select_f):
+    return itertools.chain.from_iterable(
+        _act(select_f, item) for item in iterator)
+
+
+def _where_threaded(iterator, cond_f, max_workers, ordered):
+    return (
+        item for ok, item in _threaded_map(
+            _where_pair(cond_f), iterator, max_workers, ordered)
+        if ok)
+
+
+def _select_threaded(iterator, select_f, max_workers, ordered):
+    return _threaded_map(select_f, iterator, max_workers, ordered)
+
+
+def _select_many_threaded(iterator, select_f, max_workers, ordered):
+    return itertools.chain.from_iterable(_threaded_map(
+        _select_list(select_f), iterator, max_workers, ordered))
+
+
+def _take(iterator, num):
+    return itertools.islice(iterator, max(num, 0))
+
+
+def _take_while(iterator, cond_f):
+    if cond_f is None:
+        return iterator
+    return itertools.takewhile(cond_f, iterator)
+
+
+def _take_while_i(iterator, cond_f):
+    for i, item in enumerate(iterator):
+        if cond_f is not None and not cond_f(i, item):
+            return
+        yield item
+
+
+def _skip(iterator, num):
+    for _ in range(num):
+        try:
+            next(iterator)
+        except StopIteration:
+            raise IndexError('LazyLinq: this query is so short.')
+    yield from iterator
+
+
+def _skip_while(iterator, cond_f):
+    if cond_f is None:
+        return iterator
+    return itertools.dropwhile(cond_f, iterator)
+
+
+def _skip_while_i(iterator, cond_f):
+    if cond_f is None:
+        return iterator
+    return (
+        item for _, item in itertools.dropwhile(
+            lambda pair: cond_f(*pair), enumerate(iterator)))
+
+
+def _concat(iterator, linqs):
+    return itertools.chain(iterator, *linqs)
+
+
+def _default_if_empty(iterator, default):
+    empty = True
+    for item in iterator:
+        empty = False
+        yield item
+    if empty:
+        yield default
+
+
+def _distinct(iterator, key_f):
+    keys = IProbe()
+    for item in iterator:
+        if keys.add(_act(key_f, item)):
+            yield item
+
+
+def _except(iterator, other, key_f):
+    keys = IProbe(_act(key_f, item) for item in other)
+    for item in iterator:
+        if _act(key_f, item) not in keys:
+            yield item
+
+
+def _intersect(iterator, other, key_f):
+    keys = IProbe(_act(key_f, item) for item in other)
+    for item in _distinct(
+            (item for item in iterator if _act(key_f, item) in keys), None):
+        yield item
+
+
+def _union(iterator, other, key_f):
+    keys = IProbe()
+    for item in _distinct(iterator, None):
+        keys.add(_act(key_f, item))
+        yield item
+    for item in _distinct(other, None):
+        if _act(key_f, item) not in keys:
+            yield item
+
+
+def _distinct_sorted(iterator, key_f):
+    prev = _EMPTY
+    for item in iterator:
+        key = _act(key_f, item)
+        if prev is _EMPTY or key != prev:
+            yield item
+        prev = key
+
+
+def _group_runs(iterator, grouping_f):
+    for key, items in itertools.groupby(iterator, grouping_f):
+        yield key, Linq(items)
+
+
+def _merge_join(iterator, other, key_f, val_f, select_f, desc):
+    before = operator.gt if desc else operator.lt
+    inners = ((_act(val_f, item), item) for item in other)
+    value, inner = next(inners, (_EMPTY, _EMPTY))
+    run_key, run = _EMPTY, list()
+    for item in iterator:
+        key = _act(key_f, item)
+        if run_key is _EMPTY or run_key != key:
+            # move ``other`` to the run of ``key``
+            while inner is not _EMPTY and before(value, key):
+                value, inner = next(inners, (_EMPTY, _EMPTY))
+            if inner is _EMPTY:
+                return
+            run_key, run = key, list()
+            while inner is not _EMPTY and value == key:
+                run.append(inner)
+                value, inner = next(inners, (_EMPTY, _EMPTY))
+        for item2 in run:
+            yield (item, item2) if select_f is None else select_f(item, item2)
+
+
+def _zip(iterator, other, zip_f):
+    if zip_f is None:
+        return zip(iterator, other)
+    return (zip_f(item, item2) for item, item2 in zip(iterator, other))
+
+
+def _reverse(iterator):
+    return reversed(list(iterator))
+
+
+def _order_by(iterator, orders):
+    return iter(_sorted_by(iterator, orders))
+
+
+def _top(iterator, num, key_f, desc):
+    return iter(_top_items(iterator, num, key_f, desc))
+
+
+def _bottom(iterator, num, key_f, desc):
+    return iter(_bottom_items(iterator, num, key_f, desc))
+
+
+def _scan(iterator, initial_value, func):
+    val = initial_value
+    yield val
+    for item in iterator:
+        val = func(val, item)
+        yield val
+
+
+# Runs of the following stages are fused into one generated loop, so that
+# each item passes one generator instead of one generator per stage.
+# ``None`` functions are left out of the generated code.
+_FUSIBLE_STAGES = {
+    _where: 'where',
+    _select: 'select',
+    _select_i: 'select_i',
+    _take: 'take',
+    _take_while: 'take_while',
+    _skip: 'skip',
+}
+_fused_cache = dict()
+
+
+def _fuse(stages):
+    fused_stages = list()
+    run = list()
+    for stage in stages + ((None, ()),):
+        if stage[0] in _FUSIBLE_STAGES:
+            run.append(stage)
+            continue
+        if len(run) >= 2:
+            fused_stages.append(_compile_run(run))
+        else:
+            fused_stages.extend(run)
+        run = list()
+        if stage[0] is not None:
+            fused_stages.append(stage)
+    return tuple(fused_stages)
+
+
+def _compile_run(run):
+    kinds = tuple(
+        (_FUSIBLE_STAGES[gen_f], args[0] is None) for gen_f, args in run)
+    if kinds not in _fused_cache:
+        _fused_cache[kinds] = _build_fused(kinds)
+    return (_fused_cache[kinds], tuple(args[0] for _, args in run))
+
+
+def _build_fused(kinds):
+    # ``stop`` is the index of the stage which finished the loop,
+    # ``-1`` if the source is exhausted and ``len(kinds)`` while running.
+    running = len(kinds)
+    init = ['stop = {}'.format(running)]
+    body = list()
+    checks = list()
+    reject = ['continue']
+    for j, (kind, is_none) in enumerate(kinds):
+        arg = 'a{}'.format(j)
+        if kind == 'where' and not is_none:
+            body += ['if not {}(item):'.format(arg)]
+            body += ['    ' + line for line in reject]
+        elif kind == 'select' and not is_none:
+            body += ['item = {}(item)'.format(arg)]
+        elif kind == 'select_i' and not is_none:
+            init += ['i{} = 0'.format(j)]
+            body += ['item = {}(i{}, item)'.format(arg, j)]
+            body += ['i{} += 1'.format(j)]
+        elif kind == 'take':
+            init += ['t{} = 0'.format(j)]
+            init += ['if {} <= 0:'.format(arg)]
+            init += ['    stop = {}'.format(j)]
+            body += ['t{} += 1'.format(j)]
+            body += ['if t{} >= {}:'.format(j, arg)]
+            body += ['    stop = {}'.format(j)]
+            reject = ['if stop < {}:'.format(running), '    break', 'continue']
+        elif kind == 'take_while' and not is_none:
+            body += ['if not {}(item):'.format(arg)]
+            body += ['    stop = {}'.format(j)]
+            body += ['    break']
+        elif kind == 'skip':
+            init += ['s{} = 0'.format(j)]
+            body += ['if s{} < {}:'.format(j, arg)]
+            body += ['    s{} += 1'.format(j)]
+            body += ['    ' + line for line in reject]
+            checks += ['if s{} < {} and stop < {}:'.format(j, arg, j)]
+            checks += [
+                "    raise IndexError('LazyLinq: this query is so short.')"]
+    body += ['yield item']
+    body += ['if stop < {}:'.format(running), '    break']
+
+    lines = ['def fused(iterator, {}):'.format(
+        ', '.join('a{}'.format(j) for j in range(running)))]
+    lines += ['    ' + line for line in init]
+    lines += ['    if stop == {}:'.format(running)]
+    lines += ['        for item in iterator:']
+    lines += ['            ' + line for line in body]
+    lines += ['        else:']
+    lines += ['            stop = -1']
+    lines += ['    ' + line for line in checks]
+    namespace = dict()
+    exec(compile('\n'.join(lines), '<ilinq fused stages>', 'exec'), namespace)
+    return namespace['fused']
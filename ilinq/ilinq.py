@@ -5,10 +5,12 @@
 This module provides ``Linq`` class, which is a python version of linq like c#.
 """
 
-from math import sqrt
 from collections import defaultdict
-from functools import reduce
+import heapq
 import itertools
+import operator
+from ilinq.iprobe import IProbe
+from ilinq.istats import IStats
 
 
 class Linq(list):
@@ -21,24 +23,31 @@ class Linq(list):
         >>> Linq(range(10 + 1)).where(lambda n: n % 5 == 0)
         Linq<0, 5, 10>
         """
-        return Linq([
-            item for item in self
-            if cond_f is None or cond_f(item)])
+        if cond_f is None:
+            return Linq(self)
+        return Linq([item for item in self if cond_f(item)])
 
     def where_in(self, list_, key_f=None):
         """
-        Return items which the condition that ``select_f(item)`` in ``list_``.
+        Return items which the condition that ``key_f(item)`` in ``list_``.
 
         >>> Linq([1, 3, 5, 100]).where_in([1, 2, 3])
         Linq<1, 3>
         >>> Linq([1, 3, 5, 100]).where_in(
         ...     [1, 2, 3],
-        ...     select_f=lambda x: x % 2)
+        ...     key_f=lambda x: x % 2)
         Linq<1, 3, 5>
+
+        ``list_`` is converted to ``IProbe`` unless it is already a
+        ``IProbe``, ``set``, ``frozenset`` or ``dict`` (e.g. ``ILookup``).
+        To reuse the probe, create it once by ``Linq.to_probe``.
+
+        >>> probe = Linq([1, 2, 3]).to_probe()
+        >>> Linq([1, 3, 5, 100]).where_in(probe)
+        Linq<1, 3>
         """
-        return self.where(
-            lambda x: x in list_ if key_f is None else
-            key_f(x) in list_)
+        probe = _as_probe(list_)
+        return self.where(lambda x: _act(key_f, x) in probe)
 
     def select(self, select_f=None):
         """
@@ -47,8 +56,9 @@ class Linq(list):
         >>> Linq(range(10 + 1)).select(lambda n: n % 3)
         Linq<0, 1, 2, 0, 1, 2, 0, 1, 2, 0, 1>
         """
-        return Linq([
-            _act(select_f, item) for item in self[:]])
+        if select_f is None:
+            return Linq(self)
+        return Linq([select_f(item) for item in self])
 
     def select_i(self, select_f=None):
         """
@@ -58,8 +68,9 @@ class Linq(list):
         >>> linq.select_i(lambda i, x: x ** i)
         Linq<1, 3, 4, 1, 0>
         """
-        return Linq([(
-            _act_i(select_f, i, item)) for i, item in enumerate(self)])
+        if select_f is None:
+            return Linq(self)
+        return Linq([select_f(i, item) for i, item in enumerate(self)])
 
     def select_many(self, select_f=None):
         """
@@ -69,11 +80,57 @@ class Linq(list):
         ...     {"name": "yassu", "ids": (12, 13)},
         ...     {"name": "aiya",  "ids": (20, 21)}])
         >>> linq.select_many(lambda obj: obj["ids"])
-        (12, 13, 20, 21)
+        Linq<12, 13, 20, 21>
+
+        The selected objects may be any iterables, e.g. tuples, lists,
+        Linqs or generators.  Use ``lazy().select_many`` not to materialize
+        the flattened items.
+        """
+        return Linq(itertools.chain.from_iterable(
+            _act(select_f, item) for item in self))
+
+    def where_threaded(self, cond_f, max_workers=None, ordered=True):
+        """
+        Return the Linq instance filtered by ``cond_f``, which is called in
+        ``max_workers`` threads.
+        This method is suitable for I/O-bound ``cond_f``.
+
+        >>> Linq(range(10)).where_threaded(lambda n: n % 5 == 0)
+        Linq<0, 5>
+        """
+        from ilinq.iparallel import _threaded_map, _where_pair
+        return Linq(
+            item for ok, item in _threaded_map(
+                _where_pair(cond_f), self, max_workers, ordered)
+            if ok)
+
+    def select_threaded(self, select_f, max_workers=None, ordered=True):
         """
-        return Linq(reduce(
-            lambda x, y: x + y,
-            [(_act(select_f, item)) for item in self[:]]))
+        Return the linq instance selected by ``select_f``, which is called in
+        ``max_workers`` threads.
+        This method is suitable for I/O-bound ``select_f``.
+
+        At most ``max_workers * 2`` items are processed at once.
+        If ``ordered`` is ``False``, items are returned in completed order.
+        If some calls fail, the error of the first failed item is raised.
+
+        >>> Linq(range(5)).select_threaded(lambda n: n * n, max_workers=2)
+        Linq<0, 1, 4, 9, 16>
+        """
+        from ilinq.iparallel import _threaded_map
+        return Linq(_threaded_map(select_f, self, max_workers, ordered))
+
+    def select_many_threaded(self, select_f, max_workers=None, ordered=True):
+        """
+        Return the linq instance selected by ``select_f`` and flatten.
+        ``select_f`` is called in ``max_workers`` threads.
+
+        >>> Linq([1, 2]).select_many_threaded(lambda n: [n] * n)
+        Linq<1, 2, 2>
+        """
+        from ilinq.iparallel import _threaded_map, _select_list
+        return Linq(itertools.chain.from_iterable(_threaded_map(
+            _select_list(select_f), self, max_workers, ordered)))
 
     def select_many_i(self, select_f=None):
         """
@@ -97,7 +154,7 @@ class Linq(list):
         >>> linq.take(100)
         Linq<0, 1, 2, 3, 4, 5, 6, 7, 8, 9>
         """
-        return Linq([self[j] for j in range(min(num, len(self)))])
+        return self[:max(num, 0)]
 
     def take_while(self, cond_f=None):
         """
@@ -132,14 +189,7 @@ class Linq(list):
         """
         if cond_f is None:
             return self
-
-        list_ = list()
-        for i in range(self.count()):
-            if cond_f(i, self[i]):
-                list_.append(self[i])
-            else:
-                break
-        return Linq(list_)
+        return self[:_while_length(self, cond_f)]
 
     def skip(self, num):
         """
@@ -148,7 +198,7 @@ class Linq(list):
         >>> Linq(range(10)).reverse().skip(3)
         Linq<6, 5, 4, 3, 2, 1, 0>
         """
-        if self.count() >= num:
+        if len(self) >= num:
             return self[num:]
         else:
             raise IndexError('Linq: {} is so short.'.format(self))
@@ -175,14 +225,13 @@ class Linq(list):
         """
         if cond_f is None:
             return self
-
-        j = 0
-        while j < self.count() and cond_f(j, self[j]):
-            j += 1
-        return self[j:]
+        return self[_while_length(self, cond_f):]
 
     def concat(self, *linqs):
         """
+        Return the Linq which consists of items of ``self`` and ``linqs``.
+        ``linqs`` may be any iterables.
+
         >>> linq = Linq(range(4))
         >>> linq.concat(Linq(range(5)).select(lambda x: x*x))
         Linq<0, 1, 2, 3, 0, 1, 4, 9, 16>
@@ -192,7 +241,7 @@ class Linq(list):
         >>> linq1.concat(linq2, linq3)
         Linq<0, 1, 2, 3, 4, 0, 1, 4, 9, 0, 1, 8>
         """
-        return self + Linq(linqs).inject(Linq([]), lambda x, y: x + y)
+        return Linq(itertools.chain(self, *linqs))
 
     def default_if_empty(self, default=None):
         """
@@ -207,9 +256,8 @@ class Linq(list):
         >>> Linq([]).default_if_empty("default")
         Linq<default>
         """
-        list_ = Linq(self[:]).take(1)
-        if len(list_) == 1:
-            return Linq(self[:])
+        if len(self) > 0:
+            return self[:]
         else:
             return Linq([default])
 
@@ -217,18 +265,74 @@ class Linq(list):
     def repeat(obj, num):
         """
         Return Linq instance which has ``num`` objs.
+        The result is ``LinqView`` which doesn't make the list of items.
 
         >>> Linq.repeat('Hello', 5)
         Linq<Hello, Hello, Hello, Hello, Hello>
         """
-        return Linq([obj] * num)
+        return LinqView(_Repeat(obj, num))
 
     @staticmethod
     def range(*args):
         """
-        alias to Linq(range(*args))
+        alias to Linq(range(*args)).
+        The result is ``LinqView`` of ``range(*args)``, so that ``len``,
+        indexing, ``contains``, ``sum``, ``min``, ``max``, ``take``,
+        ``skip`` and ``count`` don't make the list of items.
+
+        >>> Linq.range(10 ** 12).skip(10).take(3).sum()
+        33
+        """
+        return LinqView(range(*args))
+
+    @staticmethod
+    def from_lines(path, encoding='utf-8', compression=None):
+        """
+        Return ``LazyLinq`` of lines of the file ``path`` without line
+        endings.  The lines are read when the result is iterated, so that
+        files larger than memory can be processed.
+
+        Files are read by a text reader with a 1 MiB buffer, which splits
+        lines at ``'\\n'``, ``'\\r'`` and ``'\\r\\n'``.  ``compression`` is
+        one of ``'gzip'``, ``'bz2'`` and ``'xz'``.  If it is ``None``, it is
+        inferred from the suffix of ``path`` (``.gz``, ``.bz2`` or ``.xz``).
+
+        >>> Linq.from_lines('access.log.gz') \\
+        ...     .where(lambda line: ' 500 ' in line).take(10).to_list()
+        ... # doctest: +SKIP
+        """
+        from ilinq.iexternal import _Reiterable
+        from ilinq.iio import _lines
+        from ilinq.ilazy import LazyLinq
+        return LazyLinq(_Reiterable(_lines, path, encoding, compression))
+
+    @staticmethod
+    def from_csv(path, header=True, encoding='utf-8', compression=None,
+                 **fmtparams):
+        """
+        Return ``LazyLinq`` of rows of the CSV file ``path``.
+        If ``header`` is ``True``, the first row is used as field names and
+        rows are dictionaries.  Else rows are tuples.
+        ``fmtparams`` are passed to ``csv.reader``.
+        See ``Linq.from_lines``.
+        """
+        from ilinq.iexternal import _Reiterable
+        from ilinq.iio import _csv_rows
+        from ilinq.ilazy import LazyLinq
+        return LazyLinq(_Reiterable(
+            _csv_rows, path, header, encoding, compression, fmtparams))
+
+    @staticmethod
+    def from_jsonl(path, encoding='utf-8', compression=None):
         """
-        return Linq(range(*args))
+        Return ``LazyLinq`` of objects of the JSON Lines file ``path``.
+        Blank lines are skipped.  See ``Linq.from_lines``.
+        """
+        from ilinq.iexternal import _Reiterable
+        from ilinq.iio import _jsonl_records
+        from ilinq.ilazy import LazyLinq
+        return LazyLinq(_Reiterable(
+            _jsonl_records, path, encoding, compression))
 
     def distinct(self, key_f=None):
         """
@@ -239,14 +343,8 @@ class Linq(list):
         >>> linq1.concat(linq2).distinct()
         Linq<0, 1, 2, 3, 4, 9, 16>
         """
-        list_ = list()
-        val_list = list()
-        for item in self[:]:
-            val = _act(key_f, item)
-            if val not in val_list:
-                list_.append(item)
-                val_list.append(val)
-        return Linq(list_)
+        keys = IProbe()
+        return Linq([item for item in self if keys.add(_act(key_f, item))])
 
     def except_(self, other, key_f=None):
         """
@@ -264,7 +362,8 @@ class Linq(list):
         >>> linq1.except_(linq2, key_f=lambda x: abs(x))
         Linq<1, -4>
         """
-        return Linq([item for item in self if _act(key_f, item) not in other])
+        keys = IProbe(_act(key_f, item) for item in other)
+        return Linq([item for item in self if _act(key_f, item) not in keys])
 
     def intersect(self, other, key_f=None):
         """
@@ -280,9 +379,9 @@ class Linq(list):
         >>> linq1.intersect(linq2, key_f=abs)
         Linq<-2.1, -2.2>
         """
-        val_list = other.select(key_f)
+        keys = IProbe(_act(key_f, item) for item in other)
         return Linq(
-            [item for item in self if _act(key_f, item) in val_list])   \
+            [item for item in self if _act(key_f, item) in keys])   \
             .distinct()
 
     def union(self, other, key_f=None):
@@ -293,11 +392,11 @@ class Linq(list):
         Linq<1, 2, 3, 4, 5, 6>
         """
         list_ = self.distinct()
-        val_list = list_.select(key_f)
+        keys = IProbe(_act(key_f, item) for item in list_)
         return list_ + \
             Linq([
                 item for item in Linq(other).distinct()
-                if _act(key_f, item) not in val_list])
+                if _act(key_f, item) not in keys])
 
     def zip(self, other, zip_f=None):
         """
@@ -322,7 +421,8 @@ class Linq(list):
         """
         Return reversed Linq object.
 
-        Note that this method is overrited from list class.
+        Note that this method is overrited from list class and ``self`` is
+        not changed.
 
         >>> linq = Linq(range(6))
         >>> linq
@@ -330,21 +430,20 @@ class Linq(list):
         >>> linq.reverse()
         Linq<5, 4, 3, 2, 1, 0>
         """
-        linq = self
-        list.reverse(linq)
-        return linq
+        return self[::-1]
 
-    def order_by(self, key_f=None, desc=False):
+    def order_by(self, key_f=None, desc=False, spill_dir=None,
+                 memory_limit=None):
         """
         If ``desc=False`` and ``key_f=None``, sort in ascending order.
 
         >>> Linq([1.1, 2.3, -2, 5.3, 1.3]).order_by()
-        Linq<-2, 1.1, 1.3, 2.3, 5.3>
+        OrderedLinq<-2, 1.1, 1.3, 2.3, 5.3>
 
         If ``desc=True``, sort in descending order
 
         >>> Linq([1.1, 2.3, -2, 5.3, 1.3]).order_by(desc=True)
-        Linq<5.3, 2.3, 1.3, 1.1, -2>
+        OrderedLinq<5.3, 2.3, 1.3, 1.1, -2>
 
         If ``key_f`` is not ``None``, sort by result of ``key_f``.
 
@@ -353,12 +452,50 @@ class Linq(list):
         ...     {"name": "person2", "age": 25},
         ...     {"name": "person3", "age": 21}])
         >>> linq.order_by(key_f=lambda person: person["age"])
-        Linq<
+        OrderedLinq<
             {'name': 'person3', 'age': 21},
             {'name': 'person1', 'age': 23},
             {'name': 'person2', 'age': 25}>
+
+        The result is ``OrderedLinq``, which can be sorted by more keys by
+        ``then_by`` and ``then_by_descending``.
+
+        If ``spill_dir`` or ``memory_limit`` is given, ``OrderedLazyLinq``
+        sorted by an external merge sort is returned.  Runs of
+        ``memory_limit`` items are sorted and spilled to temporary files in
+        ``spill_dir``, and the runs are merged when the result is iterated.
+        See ``LazyLinq.order_by``.
+
+        >>> Linq([3, 1, 2]).order_by(memory_limit=2).to_list()
+        [1, 2, 3]
+        """
+        if spill_dir is not None or memory_limit is not None:
+            return self.lazy().order_by(key_f, desc, spill_dir, memory_limit)
+        return OrderedLinq(self, ((key_f, desc),))
+
+    def top(self, num, key_f=None, desc=False):
+        """
+        Return first ``num`` items of ``self.order_by(key_f, desc)``.
+        This method selects items by a heap without sorting all items.
+
+        >>> Linq([5, 1, 4, 2, 3]).top(2)
+        Linq<1, 2>
+        >>> Linq([5, 1, 4, 2, 3]).top(2, desc=True)
+        Linq<5, 4>
+        """
+        return Linq(_top(self, num, key_f, desc))
+
+    def bottom(self, num, key_f=None, desc=False):
+        """
+        Return last ``num`` items of ``self.order_by(key_f, desc)``.
+        This method selects items by a heap without sorting all items.
+
+        >>> Linq([5, 1, 4, 2, 3]).bottom(2)
+        Linq<4, 5>
+        >>> Linq([5, 1, 4, 2, 3]).bottom(2, desc=True)
+        Linq<2, 1>
         """
-        return Linq(sorted(self[:], key=key_f, reverse=desc))
+        return Linq(_bottom(self, num, key_f, desc))
 
     def scan(self, initial_value, func):
         """
@@ -395,7 +532,8 @@ class Linq(list):
             res = func(res, item)
         return _act(last_f, res)
 
-    def join(self, other, key_f, val_f, select_f):
+    def join(self, other, key_f, val_f, select_f, spill_dir=None,
+             partitions=None):
         """
         inner join ``self`` and ``other`` by ``key_f``, ``val_f`` and
         ``select_f``.
@@ -424,11 +562,23 @@ class Linq(list):
             {'person': 'person1', 'dog': 'dog3'},
             {'person': 'person2', 'dog': 'dog2'}
         >
+
+        ``key_f`` and ``val_f`` are called once per item.  If all keys are
+        hashable, the items are matched through a hash table built on the
+        smaller side.
+
+        If ``spill_dir`` or ``partitions`` is given, both sides are
+        hash-partitioned to ``partitions`` temporary files in ``spill_dir``
+        and the ``LazyLinq`` which joins one pair of partitions at a time is
+        returned (Grace hash join).  Keys must be hashable and the results
+        are ordered by partitions.
         """
-        return Linq([
-            select_f(item, item2)
-            for item in self for item2 in other
-            if key_f(item) == val_f(item2)])
+        if spill_dir is not None or partitions is not None:
+            from ilinq.iexternal import _spilled_join
+            from ilinq.ilazy import LazyLinq
+            return LazyLinq(_spilled_join(
+                self, other, key_f, val_f, select_f, spill_dir, partitions))
+        return Linq(_join(self, other, key_f, val_f, select_f))
 
     def group_join(self, other, key_f, value_f, select_f):
         """
@@ -460,19 +610,28 @@ class Linq(list):
             {'person': 'person-1', 'dogs': Linq<>}
         >
         """
+        other = list(other)
+        values = [value_f(item2) for item2 in other]
+        hashable = all(map(_is_hashable, values))
+        d = defaultdict(lambda: Linq([]))
+        if hashable:
+            for item2, value in zip(other, values):
+                d[value].append(item2)
+
         linq = Linq()
         for item in self:
-            key_value = key_f(item)
-            value_linq = Linq()
-            for item2 in other:
-                value_value = value_f(item2)
-                if key_value == value_value:
-                    value_linq.append(item2)
+            key = key_f(item)
+            if hashable and _is_hashable(key):
+                value_linq = Linq(d.get(key, ()))
+            else:
+                value_linq = Linq([
+                    item2 for item2, value in zip(other, values)
+                    if key == value])
             linq.append(select_f(item, value_linq))
-        res = linq
-        return res
+        return linq
 
-    def to_lookup(self, key_f=None, value_f=None):
+    def to_lookup(self, key_f=None, value_f=None, spill_dir=None,
+                  partitions=None):
         """
         Return the dictionary from ``key_f(item)`` to Linq object of some of
         ``key_f(item)``.
@@ -488,7 +647,18 @@ class Linq(list):
             Legumeidae: Linq<natto, Kidney beans>,
             Solanaceae: Linq<tomato>
         >
+
+        If ``spill_dir`` or ``partitions`` is given, the items are
+        hash-partitioned to ``partitions`` temporary files in ``spill_dir``
+        and the streaming ``LazyILookup`` is returned, which groups one
+        partition at a time.  Keys are ordered by partitions.
         """
+        if spill_dir is not None or partitions is not None:
+            from ilinq.iexternal import _spilled_groups
+            from ilinq.ilookup import LazyILookup
+            return LazyILookup(_spilled_groups(
+                self, key_f, value_f, spill_dir, partitions))
+
         from ilinq.ilookup import ILookup
         d = defaultdict(lambda: Linq([]))
         for item in self:
@@ -506,7 +676,9 @@ class Linq(list):
         >>> Linq(range(10)).count(lambda x: x >= 8)
         2
         """
-        return len(self.where(cond_f))
+        if cond_f is None:
+            return len(self)
+        return sum(1 for item in self if cond_f(item))
 
     def first(self, cond_f=None):
         """
@@ -517,7 +689,7 @@ class Linq(list):
         >>> Linq([3, 2, 5, 8]).first(cond_f=lambda x: x % 2 == 0)
         2
         """
-        for item in self[:]:
+        for item in self:
             if cond_f is None or cond_f(item):
                 return item
         raise IndexError('This linq with condition is Empty.')
@@ -562,12 +734,12 @@ class Linq(list):
         single
         IndexError: This linq with condition is more long.
         """
-        obj = self.where(cond_f)
-        if obj.count() == 0:
+        items = _take_matches(self, cond_f, 2)
+        if len(items) == 0:
             raise IndexError('This linq with condition is empty.')
-        elif obj.count() == 2:
+        elif len(items) == 2:
             raise IndexError('This linq with condition is more long.')
-        return obj[0]
+        return items[0]
 
     def single_or_default(self, default=None, cond_f=None):
         """
@@ -592,10 +764,12 @@ class Linq(list):
             @staticmethod
         IndexError: This linq with condition is more long.
         """
-        obj = self.where(cond_f)
-        if obj.count() == 0:
+        items = _take_matches(self, cond_f, 2)
+        if len(items) == 0:
             return default
-        return obj.single()
+        elif len(items) == 2:
+            raise IndexError('This linq with condition is more long.')
+        return items[0]
 
     def last(self, cond_f=None):
         """
@@ -606,7 +780,10 @@ class Linq(list):
         >>> Linq([3, 2, 5, 8]).last(lambda x: x % 4 == 1)
         5
         """
-        return self.where(cond_f)[-1]
+        for item in reversed(self):
+            if cond_f is None or cond_f(item):
+                return item
+        raise IndexError('This linq with condition is Empty.')
 
     def last_or_default(self, cond_f=None, default=None):
         """
@@ -622,10 +799,10 @@ class Linq(list):
         ...     default=-100)
         -100
         """
-        try:
-            return self.where(cond_f).last()
-        except IndexError:
-            return default
+        for item in reversed(self):
+            if cond_f is None or cond_f(item):
+                return item
+        return default
 
     def element_at(self, ind):
         """
@@ -633,10 +810,11 @@ class Linq(list):
 
         >>> Linq([3, 2, 5, 8]).element_at(2)
         5
+
+        If ``ind`` is negative or out of range, ``IndexError`` is raised.
         """
-        list_ = self.take(ind + 1).to_list()
-        if len(list_) == ind + 1:
-            return list_[ind]
+        if 0 <= ind < len(self):
+            return self[ind]
         raise IndexError("This linq doesn't have {} items.".format(ind))
 
     def element_at_or_default(self, num, default=None):
@@ -686,12 +864,19 @@ class Linq(list):
         >>> linq.min_all(key_f=lambda x: x % 4)
         Linq<0, 4, 0>
         """
-        if self.count() == 0:
-            return Linq()
-        min_value = self.select(key_f).min()
-        return self.where(
-            cond_f=lambda item:
-            _act(key_f, item) == min_value)
+        return Linq([item for _, item in _extremes(self, key_f, operator.lt)])
+
+    def argmin(self, key_f=None):
+        """
+        Return the first index of minimal value computed by ``key_f``.
+        ``key_f`` is called once per item.
+
+        >>> Linq([3, -4, 2, -4]).argmin()
+        1
+        >>> Linq([3, -4, 2, -4]).argmin(abs)
+        2
+        """
+        return _first_index(_extremes(self, key_f, operator.lt))
 
     def max(self, key_f=None):
         """
@@ -723,11 +908,19 @@ class Linq(list):
         >>> linq.max_all(key_f=lambda x: x % 3)
         Linq<2, 2>
         """
-        if self.count() == 0:
-            return Linq()
+        return Linq([item for _, item in _extremes(self, key_f, operator.gt)])
+
+    def argmax(self, key_f=None):
+        """
+        Return the first index of maximal value computed by ``key_f``.
+        ``key_f`` is called once per item.
 
-        max_value = self.max(key_f=key_f)
-        return self.where(lambda item: _act(key_f, item) == max_value)
+        >>> Linq([3, -4, 2, -4]).argmax()
+        0
+        >>> Linq([3, -4, 2, -4]).argmax(abs)
+        1
+        """
+        return _first_index(_extremes(self, key_f, operator.gt))
 
     def sum(self, key_f=None):
         """
@@ -742,7 +935,7 @@ class Linq(list):
         >>> persons.sum(key_f=lambda x: x['age'])
         28
         """
-        return sum(self.select(key_f))
+        return sum(_act(key_f, item) for item in self)
 
     def average(self, select_f=None):
         """
@@ -757,16 +950,24 @@ class Linq(list):
         >>> persons.average(select_f=lambda x: x['age'])
         14.0
         """
-        return self.select(select_f).sum() / float(self.count())
+        return self.stats(select_f).mean
 
     def std(self, key_f=None):
         """
         Return standard deviation
         """
-        values = self.select(key_f)
-        ave = values.average()
-        return sqrt(
-            values.sum(key_f=lambda x: (x - ave)**2)/float(values.count()))
+        return self.stats(key_f).std
+
+    def stats(self, key_f=None):
+        """
+        Return ``IStats`` of ``key_f(item)``, which has count, sum, mean,
+        variance, std, min and max computed by one scan.
+
+        >>> stats = Linq([71, 80, 89, 80, 54]).stats()
+        >>> stats.count, stats.sum, stats.mean, stats.min, stats.max
+        (5, 374, 74.8, 54, 89)
+        """
+        return IStats(_act(key_f, item) for item in self)
 
     def contains(self, item, key_f=None):
         """
@@ -783,7 +984,8 @@ class Linq(list):
         ...     key_f=lambda b: b['code'])
         True
         """
-        return _act(key_f, item) in self.select(key_f)
+        value = _act(key_f, item)
+        return value in (self if key_f is None else map(key_f, self))
 
     def all(self, cond_f):
         """
@@ -796,7 +998,7 @@ class Linq(list):
         >>> numbers.all(lambda n: n % 8 == 0)
         False
         """
-        return not(False in self.select(cond_f))
+        return False not in (_act(cond_f, item) for item in self)
 
     def any(self, cond_f=None):
         """
@@ -810,9 +1012,9 @@ class Linq(list):
         >>> Linq([1, 2, 3, 4, 5]).any(lambda n: n == 3)
         True
         """
-        return self.select(cond_f).contains(True)
+        return True in (_act(cond_f, item) for item in self)
 
-    def group_by(self, grouping_f):
+    def group_by(self, grouping_f, spill_dir=None, partitions=None):
         """
         Group items by ``grouping_f``.
 
@@ -831,7 +1033,22 @@ class Linq(list):
             {Meat:
                 Linq<{'name': 'hormone', 'kind': 'Meat'}>}
         >
+
+        If ``spill_dir`` or ``partitions`` is given, the items are
+        hash-partitioned to ``partitions`` temporary files in ``spill_dir``
+        and the streaming ``LazyIGroup`` is returned, which groups one
+        partition at a time.  Keys are ordered by partitions.
+
+        >>> foods.group_by(lambda f: f['kind'], partitions=4) \\
+        ...     .select(lambda pair: pair.values.count()).order_by().to_list()
+        [1, 3]
         """
+        if spill_dir is not None or partitions is not None:
+            from ilinq.iexternal import _spilled_groups
+            from ilinq.igroup import LazyIGroup
+            return LazyIGroup(_spilled_groups(
+                self, grouping_f, None, spill_dir, partitions))
+
         from ilinq.igroup import IPair, IGroup
         group_dict = defaultdict(lambda: Linq([]))
         for item in self[:]:
@@ -839,6 +1056,42 @@ class Linq(list):
 
         return IGroup([IPair(*pair) for pair in group_dict.items()])
 
+    def assume_sorted(self, key_f=None, desc=False):
+        """
+        Return the ``SortedLazyLinq`` which assumes that the items are
+        sorted by ``key_f``.  Its ``join``, ``group_by`` and ``distinct``
+        stream the items in constant memory.
+        See ``LazyLinq.assume_sorted``.
+
+        >>> Linq([1, 1, 2, 3, 3]).assume_sorted().group_by() \\
+        ...     .select(lambda pair: pair.key).to_list()
+        [1, 2, 3]
+        """
+        return self.lazy().assume_sorted(key_f, desc)
+
+    def lazy(self):
+        """
+        Return ``LazyLinq`` object whose operators are executed deferred.
+
+        >>> Linq(range(10)).lazy().where(lambda n: n > 5).take(2).to_list()
+        [6, 7]
+        """
+        from ilinq.ilazy import LazyLinq
+        return LazyLinq(self)
+
+    def as_parallel(self, workers=None, chunk_size=None, ordered=True):
+        """
+        Return ``ParallelLinq`` object whose ``where``, ``select`` and
+        ``select_many`` are executed in ``workers`` processes.
+
+        >>> def is_even(n):
+        ...     return n % 2 == 0
+        >>> Linq(range(10)).as_parallel().where(is_even)
+        ParallelLinq<0, 2, 4, 6, 8>
+        """
+        from ilinq.iparallel import ParallelLinq
+        return ParallelLinq(self, workers, chunk_size, ordered)
+
     def to_list(self):
         """
         Return the list of items.
@@ -846,11 +1099,75 @@ class Linq(list):
         """
         return list(self)
 
+    def to_csv(self, path, header=True, encoding='utf-8', compression=None,
+               **fmtparams):
+        """
+        Write items to the CSV file ``path`` through a large buffer and
+        return ``IWriteResult``.
+
+        If items are dictionaries, the keys of the first item are the field
+        names, which are written as the first row if ``header`` is ``True``.
+        Else items are sequences of values.  ``header`` may be the list of
+        field names.  ``compression`` is one of ``'gzip'``, ``'bz2'`` and
+        ``'xz'``, and if it is ``None``, it is inferred from the suffix of
+        ``path``.  ``fmtparams`` are passed to ``csv.writer``.
+
+        >>> Linq([{'id': 1}, {'id': 2}]).to_csv('ids.csv.gz').rows
+        ... # doctest: +SKIP
+        2
+        """
+        from ilinq.iio import _write_csv
+        return _write_csv(self, path, header, encoding, compression, fmtparams)
+
+    def to_jsonl(self, path, encoding='utf-8', compression=None):
+        """
+        Write items to the JSON Lines file ``path`` through a large buffer
+        and return ``IWriteResult``.  See ``Linq.to_csv``.
+        """
+        from ilinq.iio import _write_jsonl
+        return _write_jsonl(self, path, encoding, compression)
+
+    def to_sqlite(self, database, table, columns=None, batch_size=None):
+        """
+        Insert items to ``table`` of the SQLite ``database`` and return
+        ``IWriteResult``.  ``database`` is a path or ``sqlite3.Connection``.
+
+        Items are inserted by ``executemany`` in batches of ``batch_size``
+        rows in one transaction, which is rolled back if an error occurs.
+        If items are dictionaries, the keys of the first item are the
+        columns unless ``columns`` is given.  If the columns are known, the
+        table is created if it doesn't exist.
+        """
+        from ilinq.iio import _write_sqlite
+        return _write_sqlite(self, database, table, columns, batch_size)
+
+    def to_probe(self, key_f=None):
+        """
+        Return ``IProbe`` of ``key_f(item)``, which can be passed to
+        ``where_in`` repeatedly.
+
+        >>> probe = Linq([{'id': 1}, {'id': 3}]).to_probe(lambda x: x['id'])
+        >>> 3 in probe
+        True
+        """
+        return IProbe(_act(key_f, item) for item in self)
+
     def copy(self):
         """
         Return shallow copied self
         """
-        return Linq(self[:])
+        return Linq(self)
+
+    def view(self, start=None, stop=None, step=None):
+        """
+        Return ``LinqView`` of ``self[start:stop:step]``, which refers to
+        the items of ``self`` without copying them.
+        Changes of ``self`` are seen through the view.
+
+        >>> Linq(range(10)).view(2, 8, 3)
+        Linq<2, 5>
+        """
+        return LinqView(self, range(len(self))[start:stop:step])
 
     def to_set(self):
         """
@@ -885,13 +1202,23 @@ class Linq(list):
             raise ValueError('key numbers are dupplicated.')
 
     def __add__(self, other):
-        return Linq(super().__add__(other))
+        if not isinstance(other, list):
+            return NotImplemented
+        return Linq(itertools.chain(self, other))
 
     def __getitem__(self, val):
-        if isinstance(val, int):
-            return super().__getitem__(val)
-        else:
+        if isinstance(val, slice):
             return Linq(super().__getitem__(val))
+        return super().__getitem__(val)
+
+    def __eq__(self, other):
+        # ``LinqView`` doesn't keep its items in the list
+        if isinstance(other, LinqView):
+            return other.__eq__(self)
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
 
     def __str__(self):
         s = '{}<'.format(self.__class__.__name__)
@@ -906,9 +1233,485 @@ class Linq(list):
         return str(self)
 
 
+class OrderedLinq(Linq):
+    """
+    Linq sorted by
+    `ilinq.Linq.order_by <ilinq.html#ilinq.ilinq.Linq.order_by>`_.
+
+    ``then_by`` and ``then_by_descending`` sort the items of this object
+    by more keys.  The keys of the items are kept, so every key function is
+    called once per item and the items are sorted by one ``sort`` call,
+    even if directions are mixed and keys can't be negated.  Keys of items
+    appended later are computed by the next ``then_by``.
+
+    >>> persons = Linq([
+    ...     {"name": "b", "age": 23},
+    ...     {"name": "c", "age": 21},
+    ...     {"name": "a", "age": 23}])
+    >>> persons.order_by(lambda p: p["age"], desc=True) \\
+    ...     .then_by(lambda p: p["name"])  # doctest: +NORMALIZE_WHITESPACE
+    OrderedLinq<{'name': 'a', 'age': 23}, {'name': 'b', 'age': 23},
+        {'name': 'c', 'age': 21}>
+    """
+    def __init__(self, items=(), orders=(), keys=None):
+        self._orders = tuple(orders)
+        self._keys = None
+        if keys is None and len(self._orders) == 1:
+            key_f, desc = self._orders[0]
+            if key_f is None:
+                super().__init__(sorted(items, reverse=desc))
+                return
+            # keep plain keys, which are faster to sort than tuples
+            items = items if isinstance(items, list) else list(items)
+            records = sorted(
+                zip(map(key_f, items), items), key=operator.itemgetter(0),
+                reverse=desc)
+            self._keys = list(map(operator.itemgetter(0), records))
+        else:
+            if keys is None:
+                items = list(items)
+                keys = [_keys(item, self._orders) for item in items]
+            records = list(zip(keys, items))
+            _sort_records(records, [desc for _, desc in self._orders])
+            self._keys = list(map(operator.itemgetter(0), records))
+        super().__init__(map(operator.itemgetter(1), records))
+
+    def _item_keys(self):
+        # return the list of the tuples of keys of the items, which computes
+        # keys only for the items appended after sorting.
+        # ``self._keys`` has plain keys if there is one order.
+        if len(self._orders) == 1:
+            key_f = self._orders[0][0]
+            if self._keys is None:
+                self._keys = [_act(key_f, item) for item in self]
+            else:
+                self._keys.extend(
+                    _act(key_f, item) for item
+                    in itertools.islice(self, len(self._keys), None))
+            return [(key,) for key in self._keys]
+        if self._keys is None:
+            self._keys = [_keys(item, self._orders) for item in self]
+        else:
+            self._keys.extend(
+                _keys(item, self._orders) for item
+                in itertools.islice(self, len(self._keys), None))
+        return self._keys
+
+    def then_by(self, key_f=None, desc=False):
+        """
+        Return the OrderedLinq sorted by the previous keys and ``key_f``.
+
+        >>> Linq([(1, 'b'), (0, 'c'), (1, 'a')]).order_by(lambda x: x[0]) \\
+        ...     .then_by(lambda x: x[1])
+        OrderedLinq<(0, 'c'), (1, 'a'), (1, 'b')>
+        """
+        keys = [
+            item_keys + (_act(key_f, item),)
+            for item_keys, item in zip(self._item_keys(), self)]
+        return OrderedLinq(self, self._orders + ((key_f, desc),), keys)
+
+    def then_by_descending(self, key_f=None):
+        """
+        Return the OrderedLinq sorted by the previous keys and ``key_f`` in
+        descending order.
+
+        >>> Linq([(1, 'b'), (0, 'c'), (1, 'a')]).order_by(lambda x: x[0]) \\
+        ...     .then_by_descending(lambda x: x[1])
+        OrderedLinq<(0, 'c'), (1, 'b'), (1, 'a')>
+        """
+        return self.then_by(key_f, desc=True)
+
+
+class LinqView(Linq):
+    """
+    Linq which refers to ``parent[i]`` for ``i`` in ``indices`` without
+    copying items.  This object is returned by
+    `ilinq.Linq.view <ilinq.html#ilinq.ilinq.Linq.view>`_, and its slices,
+    ``take``, ``skip`` and ``reverse`` return ``LinqView`` of the same
+    parent.
+
+    ``parent`` may be a list or a virtual sequence, which is ``range`` or
+    the repeat of an object (see ``Linq.range`` and ``Linq.repeat``).
+    For a virtual sequence, ``sum``, ``min`` and ``max`` are computed
+    arithmetically.
+
+    The items are copied when this object is changed (e.g. ``append``) and
+    then this object works as ``Linq``.  Until then, changes of ``parent``
+    are seen through this object like ``memoryview``, so that the indices
+    must stay valid.  Use ``copy()`` to keep the current items.
+
+    >>> linq = Linq(range(10))
+    >>> view = linq.view(2, 8, 2)
+    >>> view
+    Linq<2, 4, 6>
+    >>> view.append(100)
+    >>> view, linq.count()
+    (Linq<2, 4, 6, 100>, 10)
+    """
+    def __init__(self, parent, indices=None):
+        super().__init__()
+        if indices is None:
+            indices = range(len(parent))
+        if isinstance(parent, LinqView) and parent._parent is not None:
+            indices = parent._indices[_to_slice(indices)]
+            parent = parent._parent
+        self._parent = parent
+        self._indices = indices
+        if isinstance(parent, list):
+            self._getitem = list.__getitem__
+        else:
+            self._getitem = type(parent).__getitem__
+
+    def _virtual(self):
+        # return the virtual sequence of items or ``None``
+        if self._parent is None or isinstance(self._parent, list):
+            return None
+        return self._parent[_to_slice(self._indices)]
+
+    def _materialize(self):
+        if self._parent is not None:
+            items = self._getitem(self._parent, _to_slice(self._indices))
+            self._parent = None
+            self._indices = None
+            list.extend(self, items)
+
+    def copy(self):
+        """
+        Return shallow copied self
+        """
+        return Linq(self)
+
+    def sum(self, key_f=None):
+        """
+        Return total of ``key_f(item)``.
+        """
+        items = self._virtual()
+        if key_f is None and isinstance(items, range):
+            if len(items) == 0:
+                return 0
+            return len(items) * (items[0] + items[-1]) // 2
+        if key_f is None and isinstance(items, _Repeat) \
+                and type(items.obj) is int:
+            return items.obj * len(items)
+        return super().sum(key_f)
+
+    def min(self, key_f=None):
+        """
+        Return minimal value in this object.
+        """
+        items = self._virtual()
+        if isinstance(items, _Repeat) and len(items) > 0:
+            return items.obj
+        if key_f is None and isinstance(items, range) and len(items) > 0:
+            return min(items[0], items[-1])
+        return super().min(key_f)
+
+    def max(self, key_f=None):
+        """
+        Return maximal value in this object.
+        """
+        items = self._virtual()
+        if isinstance(items, _Repeat) and len(items) > 0:
+            return items.obj
+        if key_f is None and isinstance(items, range) and len(items) > 0:
+            return max(items[0], items[-1])
+        return super().max(key_f)
+
+    def contains(self, item, key_f=None):
+        """
+        Return either ``item`` is in ``self`` or not.
+        """
+        items = self._virtual()
+        if key_f is None and items is not None:
+            return item in items
+        return super().contains(item, key_f)
+
+    def __len__(self):
+        if self._parent is None:
+            return super().__len__()
+        return len(self._indices)
+
+    def __iter__(self):
+        if self._parent is None:
+            return super().__iter__()
+        items = self._virtual()
+        if items is not None:
+            return iter(items)
+        return map(
+            self._getitem, itertools.repeat(self._parent), self._indices)
+
+    def __reversed__(self):
+        if self._parent is None:
+            return super().__reversed__()
+        return map(
+            self._getitem, itertools.repeat(self._parent),
+            reversed(self._indices))
+
+    def __contains__(self, item):
+        if self._parent is None:
+            return super().__contains__(item)
+        items = self._virtual()
+        return item in (iter(self) if items is None else items)
+
+    def __getitem__(self, val):
+        if self._parent is None:
+            return super().__getitem__(val)
+        if isinstance(val, slice):
+            return LinqView(self._parent, self._indices[val])
+        return self._getitem(self._parent, self._indices[val])
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return Linq(itertools.chain(other, self))
+
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        if self._parent is None and not isinstance(other, LinqView):
+            return list.__eq__(self, other)
+        return len(self) == len(other) and all(
+            item is item2 or item == item2
+            for item, item2 in zip(self, other))
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    def __str__(self):
+        return str(self.copy())
+
+    def __reduce__(self):
+        items = self._virtual()
+        if items is not None:
+            return (LinqView, (items,))
+        return (Linq, (list(self),))
+
+
+class _Repeat(object):
+    """
+    Virtual sequence of ``num`` objects.
+    """
+    __slots__ = ('obj', '_num')
+
+    def __init__(self, obj, num):
+        self.obj = obj
+        self._num = max(num, 0)
+
+    def __len__(self):
+        return self._num
+
+    def __getitem__(self, val):
+        if isinstance(val, slice):
+            return _Repeat(self.obj, len(range(self._num)[val]))
+        # raise IndexError if ``val`` is out of range
+        range(self._num)[val]
+        return self.obj
+
+    def __iter__(self):
+        return itertools.repeat(self.obj, self._num)
+
+    def __contains__(self, item):
+        return self._num > 0 and (self.obj is item or self.obj == item)
+
+
+def _materializing(name):
+    method = getattr(Linq, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._materialize()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _dropping_keys(name):
+    method = getattr(Linq, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._keys = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+# methods which change the items of ``OrderedLinq`` except for appending
+for _name in (
+        'insert', 'pop', 'remove', 'clear', 'sort', '__setitem__',
+        '__delitem__', '__imul__'):
+    setattr(OrderedLinq, _name, _dropping_keys(_name))
+
+
+# methods which change ``LinqView`` or need the list of items
+for _name in (
+        'append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort',
+        'index', '__setitem__', '__delitem__', '__iadd__', '__imul__',
+        '__mul__', '__rmul__', '__lt__', '__le__', '__gt__', '__ge__'):
+    setattr(LinqView, _name, _materializing(_name))
+
+
+def _to_slice(indices):
+    # return the slice of the same items as the range ``indices``
+    if len(indices) == 0:
+        return slice(0, 0)
+    stop = indices[-1] + (1 if indices.step > 0 else -1)
+    return slice(indices.start, None if stop < 0 else stop, indices.step)
+
+
+class _Reversed(object):
+    """
+    Wrapper of a sort key which reverses the order.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _order_key(descs):
+    # return key function of a keys tuple and the reverse flag for sorting
+    if all(descs) or not any(descs):
+        return None, len(descs) > 0 and descs[0]
+    return (
+        lambda keys: tuple(
+            _Reversed(key) if desc else key
+            for key, desc in zip(keys, descs)),
+        False)
+
+
+def _keys(item, orders):
+    return tuple(_act(key_f, item) for key_f, _ in orders)
+
+
+def _sorted_by(items, orders):
+    # return the list of ``items`` sorted stably by ``orders``
+    if len(orders) == 1:
+        key_f, desc = orders[0]
+        return sorted(items, key=key_f, reverse=desc)
+    records = [(_keys(item, orders), item) for item in items]
+    _sort_records(records, [desc for _, desc in orders])
+    return [item for _, item in records]
+
+
+def _sort_records(records, descs):
+    # sort the list of ``(keys, item)`` stably by ``keys`` in place
+    order_key, reverse = _order_key(descs)
+    if order_key is None:
+        records.sort(key=operator.itemgetter(0), reverse=reverse)
+    else:
+        records.sort(key=lambda record: order_key(record[0]))
+
+
 def _act(func, item):
     return item if func is None else func(item)
 
 
-def _act_i(func, i, item):
-    return item if func is None else func(i, item)
+def _top(items, num, key_f, desc):
+    # heapq.nsmallest and nlargest are stable like sorted
+    if desc:
+        return heapq.nlargest(max(num, 0), items, key=key_f)
+    return heapq.nsmallest(max(num, 0), items, key=key_f)
+
+
+def _bottom(items, num, key_f, desc):
+    # the index decides ties, so that the order matches sorted
+    if desc:
+        pairs = heapq.nsmallest(
+            max(num, 0), enumerate(items),
+            key=lambda pair: (_act(key_f, pair[1]), -pair[0]))
+    else:
+        pairs = heapq.nlargest(
+            max(num, 0), enumerate(items),
+            key=lambda pair: (_act(key_f, pair[1]), pair[0]))
+    return [item for _, item in reversed(pairs)]
+
+
+def _extremes(items, key_f, better_f):
+    # return (index, item) pairs whose keys are best in one scan
+    best_key = None
+    extremes = list()
+    for i, item in enumerate(items):
+        key = _act(key_f, item)
+        if len(extremes) == 0 or better_f(key, best_key):
+            best_key = key
+            extremes = [(i, item)]
+        elif key == best_key:
+            extremes.append((i, item))
+    return extremes
+
+
+def _first_index(extremes):
+    if len(extremes) == 0:
+        raise StopIteration('This linq is empty.')
+    return extremes[0][0]
+
+
+def _while_length(items, cond_f):
+    # the number of first items such that ``cond_f(index, item)``
+    for i, item in enumerate(items):
+        if not cond_f(i, item):
+            return i
+    return len(items)
+
+
+def _take_matches(items, cond_f, num):
+    return list(itertools.islice(
+        (item for item in items if cond_f is None or cond_f(item)), num))
+
+
+def _as_probe(list_):
+    if isinstance(list_, (IProbe, set, frozenset, dict, range)):
+        return list_
+    return IProbe(list_)
+
+
+def _is_hashable(obj):
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def _join(outers, inners, key_f, val_f, select_f):
+    outers = list(outers)
+    inners = list(inners)
+    keys = [key_f(item) for item in outers]
+    values = [val_f(item) for item in inners]
+
+    if not all(map(_is_hashable, itertools.chain(keys, values))):
+        for item, key in zip(outers, keys):
+            for item2, value in zip(inners, values):
+                if key == value:
+                    yield select_f(item, item2)
+        return
+
+    if len(outers) <= len(inners):
+        # build on outers and keep the order of outers for output
+        table = defaultdict(list)
+        for i, key in enumerate(keys):
+            table[key].append(i)
+        matches = defaultdict(list)
+        for item2, value in zip(inners, values):
+            for i in table.get(value, ()):
+                matches[i].append(item2)
+        for i, item in enumerate(outers):
+            for item2 in matches.get(i, ()):
+                yield select_f(item, item2)
+    else:
+        table = defaultdict(list)
+        for item2, value in zip(inners, values):
+            table[value].append(item2)
+        for item, key in zip(outers, keys):
+            for item2 in table.get(key, ()):
+                yield select_f(item, item2)
@@ -5,6 +5,7 @@
 This module provides ``lookup`` objects.
 """
 
+from ilinq.ilazy import LazyLinq
 from ilinq.ilinq import Linq
 
 
@@ -29,3 +30,31 @@ class ILookup(dict):
 
     def __repr__(self):
         return str(self)
+
+
+class LazyILookup(LazyLinq):
+    """
+    Streaming ``ILookup``, which yields ``(key, Linq of values)`` one by one.
+    This object is returned by
+    `ilinq.Linq.to_lookup <ilinq.html#ilinq.ilinq.Linq.to_lookup>`_
+    with ``spill_dir`` or ``partitions``.
+
+    ``items`` is a re-iterable of ``(key, Linq of values)``.
+    """
+    def keys(self):
+        """
+        return ``LazyLinq`` of all keys.
+        """
+        return self.select(lambda pair: pair[0])
+
+    def values(self):
+        """
+        return ``LazyLinq`` of all ``Linq`` objects of values.
+        """
+        return self.select(lambda pair: pair[1])
+
+    def items(self):
+        """
+        return ``LazyLinq`` of all ``(key, Linq of values)``.
+        """
+        return LazyLinq(self._source, self._stages)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides ``ParallelLinq`` class, which executes operators in
+worker processes like PLINQ, and helpers for thread pools.
+"""
+
+from collections import defaultdict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed,
+    wait)
+import itertools
+import os
+import pickle
+from functools import reduce
+from ilinq.ilinq import Linq, _act
+from ilinq.istats import IStats
+
+
+class ParallelLinq(Linq):
+    """
+    Linq whose ``where``, ``select``, ``select_many`` and aggregations
+    (``group_by``, ``to_lookup``, ``count``, ``sum`` and ``stats``) are
+    executed in worker processes.
+    This object is created by
+    `ilinq.Linq.as_parallel <ilinq.html#ilinq.ilinq.Linq.as_parallel>`_.
+
+    The items are split into chunks of ``chunk_size`` items and each chunk
+    is processed by one of ``workers`` processes.  If ``ordered`` is
+    ``False``, chunks are merged in completed order.
+
+    Functions and items must be picklable.  If the function can't be
+    pickled (e.g. ``lambda``), the operator is executed serially.
+
+    >>> def is_even(n):
+    ...     return n % 2 == 0
+    >>> Linq(range(10)).as_parallel(workers=2).where(is_even)
+    ParallelLinq<0, 2, 4, 6, 8>
+    """
+    def __init__(self, iterable=(), workers=None, chunk_size=None,
+                 ordered=True):
+        super().__init__(iterable)
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._ordered = ordered
+
+    def where(self, cond_f=None):
+        """
+        Return the ParallelLinq filtered by ``cond_f`` in worker processes.
+        """
+        if cond_f is None or not self._is_parallelizable(cond_f):
+            return self._with_options(super().where(cond_f))
+        return self._with_options(self._map_chunks(_where_chunk, cond_f))
+
+    def select(self, select_f=None):
+        """
+        Return the ParallelLinq selected by ``select_f`` in worker processes.
+        """
+        if select_f is None or not self._is_parallelizable(select_f):
+            return self._with_options(super().select(select_f))
+        return self._with_options(self._map_chunks(_select_chunk, select_f))
+
+    def select_many(self, select_f=None):
+        """
+        Return the ParallelLinq selected by ``select_f`` and flatten in worker
+        processes.
+        """
+        if select_f is None or not self._is_parallelizable(select_f):
+            return self._with_options(super().select_many(select_f))
+        return self._with_options(
+            self._map_chunks(_select_many_chunk, select_f))
+
+    def group_by(self, grouping_f, spill_dir=None, partitions=None):
+        """
+        Group items by ``grouping_f`` in worker processes.
+        Each worker groups its chunk and the partial groups are merged in
+        the order of chunks, so that keys are ordered like ``Linq.group_by``.
+        If ``spill_dir`` or ``partitions`` is given, the items are spilled
+        like ``Linq.group_by`` instead.
+        """
+        from ilinq.igroup import IPair, IGroup
+        if spill_dir is not None or partitions is not None or \
+                not self._is_parallelizable(grouping_f):
+            return super().group_by(grouping_f, spill_dir, partitions)
+        group_dict = self._merge_lookups(grouping_f, None)
+        return IGroup([IPair(*pair) for pair in group_dict.items()])
+
+    def to_lookup(self, key_f=None, value_f=None, spill_dir=None,
+                  partitions=None):
+        """
+        Return ``ILookup`` like ``Linq.to_lookup``, which is built in worker
+        processes.
+        If ``spill_dir`` or ``partitions`` is given, the items are spilled
+        like ``Linq.to_lookup`` instead.
+        """
+        from ilinq.ilookup import ILookup
+        if spill_dir is not None or partitions is not None or \
+                key_f is None and value_f is None or \
+                not self._is_parallelizable(key_f) or \
+                not self._is_parallelizable(value_f):
+            return super().to_lookup(key_f, value_f, spill_dir, partitions)
+        return ILookup(self._merge_lookups(key_f, value_f))
+
+    def count(self, cond_f=None):
+        """
+        Return the number of items with condition that ``cond_f(item)``,
+        which is computed in worker processes.
+        """
+        if cond_f is None or not self._is_parallelizable(cond_f):
+            return super().count(cond_f)
+        return sum(self._run_chunks(_count_chunk, cond_f, ordered=False))
+
+    def sum(self, key_f=None):
+        """
+        Return total of ``key_f(item)``, which is computed in worker
+        processes.
+        """
+        if key_f is None or not self._is_parallelizable(key_f):
+            return super().sum(key_f)
+        return sum(self._run_chunks(_sum_chunk, key_f, ordered=False))
+
+    def stats(self, key_f=None):
+        """
+        Return ``IStats`` of ``key_f(item)``, which is computed in worker
+        processes.  ``average`` and ``std`` use this method.
+        """
+        if key_f is None or not self._is_parallelizable(key_f):
+            return super().stats(key_f)
+        return reduce(
+            lambda x, y: x.merge(y),
+            self._run_chunks(_stats_chunk, key_f, ordered=False),
+            IStats())
+
+    def as_sequential(self):
+        """
+        Return ``Linq`` which has the same items.
+
+        >>> Linq(range(3)).as_parallel().as_sequential()
+        Linq<0, 1, 2>
+        """
+        return Linq(self)
+
+    def _with_options(self, items):
+        return ParallelLinq(
+            items, self._workers, self._chunk_size, self._ordered)
+
+    def _is_parallelizable(self, func):
+        return self._workers > 1 and len(self) > 1 and _is_picklable(func)
+
+    def _chunks(self):
+        chunk_size = self._chunk_size or \
+            -(-len(self) // (self._workers * 4))
+        return [
+            list.__getitem__(self, slice(i, i + chunk_size))
+            for i in range(0, len(self), chunk_size)]
+
+    def _run_chunks(self, chunk_f, *args, ordered=True):
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = [
+                executor.submit(chunk_f, *(args + (chunk,)))
+                for chunk in self._chunks()]
+            if not ordered:
+                futures = as_completed(futures)
+            return [future.result() for future in futures]
+
+    def _map_chunks(self, chunk_f, func):
+        return itertools.chain.from_iterable(
+            self._run_chunks(chunk_f, func, ordered=self._ordered))
+
+    def _merge_lookups(self, key_f, value_f):
+        d = defaultdict(lambda: Linq([]))
+        for pairs in self._run_chunks(_lookup_chunk, key_f, value_f):
+            for key, values in pairs:
+                d[key].extend(values)
+        return d
+
+
+def _is_picklable(func):
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _where_chunk(cond_f, chunk):
+    return [item for item in chunk if cond_f(item)]
+
+
+def _select_chunk(select_f, chunk):
+    return [select_f(item) for item in chunk]
+
+
+def _select_many_chunk(select_f, chunk):
+    return list(itertools.chain.from_iterable(
+        select_f(item) for item in chunk))
+
+
+def _threaded_map(func, iterable, max_workers=None, ordered=True):
+    # At most ``max_workers * 2`` items are in flight at once.  If some
+    # calls fail, the error of the first failed item in the input order
+    # among the executed items is raised.
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if ordered:
+            yield from _ordered_map(executor, func, iterable, max_workers * 2)
+        else:
+            yield from _unordered_map(
+                executor, func, iterable, max_workers * 2)
+
+
+def _ordered_map(executor, func, iterable, max_in_flight):
+    futures = deque()
+    try:
+        for item in iterable:
+            futures.append(executor.submit(func, item))
+            if len(futures) >= max_in_flight:
+                yield futures.popleft().result()
+        while len(futures) > 0:
+            yield futures.popleft().result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _unordered_map(executor, func, iterable, max_in_flight):
+    indices = dict()
+    try:
+        for i, item in enumerate(iterable):
+            indices[executor.submit(func, item)] = i
+            while len(indices) >= max_in_flight:
+                done = wait(indices, return_when=FIRST_COMPLETED).done
+                yield from _pop_results(indices, done)
+        while len(indices) > 0:
+            done = wait(indices, return_when=FIRST_COMPLETED).done
+            yield from _pop_results(indices, done)
+    finally:
+        for future in indices:
+            future.cancel()
+
+
+def _pop_results(indices, done):
+    if any(future.exception() is not None for future in done):
+        for future in indices:
+            future.cancel()
+        wait(indices)
+        failed = [
+            future for future in indices
+            if not future.cancelled() and future.exception() is not None]
+        raise min(failed, key=indices.get).exception()
+    for future in done:
+        del indices[future]
+        yield future.result()
+
+
+def _where_pair(cond_f):
+    return lambda item: (cond_f(item), item)
+
+
+def _select_list(select_f):
+    return lambda item: list(select_f(item))
+
+
+def _lookup_chunk(key_f, value_f, chunk):
+    d = defaultdict(list)
+    for item in chunk:
+        d[_act(key_f, item)].append(_act(value_f, item))
+    return list(d.items())
+
+
+def _count_chunk(cond_f, chunk):
+    return sum(1 for item in chunk if cond_f(item))
+
+
+def _sum_chunk(key_f, chunk):
+    return sum(key_f(item) for item in chunk)
+
+
+def _stats_chunk(key_f, chunk):
+    return IStats(key_f(item) for item in chunk)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides ``IProbe`` object, which is a set for membership tests.
+"""
+
+
+class IProbe(object):
+    """
+    Set of keys for membership tests, which is used for
+    `ilinq.Linq.where_in <ilinq.html#ilinq.ilinq.Linq.where_in>`_.
+
+    Hashable keys are kept in a ``set`` and unhashable keys (e.g. ``list``
+    or ``dict``) in a list.
+
+    >>> probe = IProbe([1, [2], 3])
+    >>> [2] in probe
+    True
+    >>> 4 in probe
+    False
+    """
+    def __init__(self, keys=()):
+        self._hashables = set()
+        self._unhashables = list()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        """
+        Add ``key`` and return whether ``key`` is new or not.
+
+        >>> probe = IProbe()
+        >>> probe.add(1)
+        True
+        >>> probe.add(1)
+        False
+        """
+        if key in self:
+            return False
+        try:
+            self._hashables.add(key)
+        except TypeError:
+            self._unhashables.append(key)
+        return True
+
+    def __contains__(self, key):
+        try:
+            return key in self._hashables
+        except TypeError:
+            return key in self._unhashables
+
+    def __iter__(self):
+        yield from self._hashables
+        yield from self._unhashables
+
+    def __len__(self):
+        return len(self._hashables) + len(self._unhashables)
+
+    def __str__(self):
+        return '{}<{}>'.format(
+            self.__class__.__name__, ', '.join(str(key) for key in self))
+
+    def __repr__(self):
+        return str(self)
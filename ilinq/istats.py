@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module provides ``IStats`` object, which summarizes numbers in one pass.
+"""
+
+from copy import copy
+from math import sqrt
+
+
+class IStats(object):
+    """
+    Summary of numbers, which is computed by one scan.
+    This object is used for
+    `ilinq.Linq.stats <ilinq.html#ilinq.ilinq.Linq.stats>`_.
+
+    The variance is computed by Welford's algorithm, so that it doesn't lose
+    the precision for large values.
+
+    >>> stats = IStats([1, 2, 3, 4, 5])
+    >>> stats.count, stats.sum, stats.mean, stats.min, stats.max
+    (5, 15, 3.0, 1, 5)
+    >>> stats.variance
+    2.0
+    """
+    def __init__(self, values=()):
+        self._count = 0
+        self._sum = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = None
+        self._max = None
+        self._ordered = True
+        self._add_all(values)
+
+    def add(self, value):
+        """
+        Add ``value`` to this summary.
+        """
+        self._add_all((value,))
+
+    def _add_all(self, values):
+        # add ``values`` with local variables, which is faster than
+        # updating attributes for each value
+        count, total, mean, m2 = self._count, self._sum, self._mean, self._m2
+        min_, max_, ordered = self._min, self._max, self._ordered
+        for value in values:
+            count += 1
+            total += value
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if count == 1:
+                min_ = max_ = value
+            elif ordered:
+                try:
+                    if value < min_:
+                        min_ = value
+                    elif value > max_:
+                        max_ = value
+                except TypeError:
+                    # values like complex numbers have neither min nor max
+                    ordered = False
+                    min_ = max_ = None
+        self._count, self._sum, self._mean, self._m2 = count, total, mean, m2
+        self._min, self._max, self._ordered = min_, max_, ordered
+
+    def _unorder(self):
+        self._ordered = False
+        self._min = self._max = None
+
+    def merge(self, other):
+        """
+        Return new ``IStats`` which summarizes values of ``self`` and
+        ``other``.  This is used to combine summaries of partitions.
+
+        >>> IStats([1, 2]).merge(IStats([3, 4, 5])).variance
+        2.0
+        """
+        if self._count == 0 or other._count == 0:
+            return copy(other if self._count == 0 else self)
+        stats = IStats()
+        stats._count = self._count + other._count
+        stats._sum = self._sum + other._sum
+        delta = other._mean - self._mean
+        stats._mean = self._mean + delta * other._count / stats._count
+        stats._m2 = self._m2 + other._m2 + \
+            delta * delta * self._count * other._count / stats._count
+        if self._ordered and other._ordered:
+            try:
+                stats._min = min(self._min, other._min)
+                stats._max = max(self._max, other._max)
+            except TypeError:
+                stats._unorder()
+        else:
+            stats._unorder()
+        return stats
+
+    @property
+    def count(self):
+        """
+        return the number of values.
+        """
+        return self._count
+
+    @property
+    def sum(self):
+        """
+        return total of values.
+        """
+        return self._sum
+
+    @property
+    def mean(self):
+        """
+        return average of values.
+        If there is no value, ``ZeroDivisionError`` is raised.
+        """
+        return self._sum / float(self._count)
+
+    @property
+    def variance(self):
+        """
+        return population variance of values.
+        If there is no value, ``ZeroDivisionError`` is raised.
+        """
+        return self._m2 / float(self._count)
+
+    @property
+    def std(self):
+        """
+        return population standard deviation of values.
+        If there is no value, ``ZeroDivisionError`` is raised.
+        """
+        return sqrt(self.variance)
+
+    @property
+    def min(self):
+        """
+        return minimal value or ``None`` if there is no value or values
+        can't be compared.
+        """
+        return self._min
+
+    @property
+    def max(self):
+        """
+        return maximal value or ``None`` if there is no value or values
+        can't be compared.
+        """
+        return self._max
+
+    def __str__(self):
+        s = '{}<count: {}, sum: {}'.format(
+            self.__class__.__name__, self.count, self.sum)
+        if self.count > 0:
+            s += ', mean: {}'.format(self.mean)
+        if self.count > 0 and self._ordered:
+            s += ', std: {}, min: {}, max: {}'.format(
+                self.std, self.min, self.max)
+        return s + '>'
+
+    def __repr__(self):
+        return str(self)
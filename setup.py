@@ -10,6 +10,8 @@ classifiers = [
     "Programming Language :: Python",
     "Programming Language :: Python :: 3",
     "Programming Language :: Python :: 3 :: Only",
+    "Programming Language :: Python :: 3.6",
+    "Programming Language :: Python :: 3.7",
     "Intended Audience :: Developers",
     "Operating System :: OS Independent",
     "Topic :: Software Development :: Libraries :: Python Modules",
@@ -25,5 +27,6 @@ setup(
     author_email='yasu0320.dev@gmail.com',
     classifiers=classifiers,
     packages=find_packages(),
+    python_requires='>=3.6',
     url='https://github.com/yassu/ilinq.py',
   )
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+from nose.tools import (
+    assert_equal, assert_true, assert_false, raises, assert_is_instance)
+from ilinq.ilinq import Linq
+from ilinq.iasync import AsyncLinq
+from ilinq.igroup import IPair, IGroup
+from ilinq.ilookup import ILookup
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def _numbers(num):
+    for n in range(num):
+        await asyncio.sleep(0)
+        yield n
+
+
+async def _square(n):
+    await asyncio.sleep(0.001 * (5 - n % 5))
+    return n * n
+
+
+class TestAsyncLinq:
+    def test_to_list(self):
+        assert_equal(_run(AsyncLinq(_numbers(3)).to_list()), [0, 1, 2])
+        assert_equal(_run(AsyncLinq(range(3)).to_list()), [0, 1, 2])
+
+    def test_to_linq(self):
+        linq = _run(AsyncLinq(_numbers(3)).to_linq())
+        assert_is_instance(linq, Linq)
+        assert_equal(linq, Linq([0, 1, 2]))
+
+    def test_where(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(10)).where(lambda n: n % 3 == 0)
+                 .to_list()),
+            [0, 3, 6, 9])
+
+    def test_where2(self):
+        async def is_even(n):
+            return n % 2 == 0
+
+        assert_equal(
+            _run(AsyncLinq(_numbers(10)).where(is_even, concurrency=3)
+                 .to_list()),
+            [0, 2, 4, 6, 8])
+
+    def test_select(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(10)).select(_square).to_list()),
+            [n * n for n in range(10)])
+
+    def test_select2(self):
+        running = {'now': 0, 'max': 0}
+
+        async def f(n):
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+            await asyncio.sleep(0.001)
+            running['now'] -= 1
+            return n
+
+        assert_equal(
+            _run(AsyncLinq(range(20)).select(f, concurrency=4).to_list()),
+            list(range(20)))
+        assert_equal(running['max'], 4)
+
+    def test_select_many(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(4))
+                 .select_many(lambda n: _numbers(n)).to_list()),
+            [0, 0, 1, 0, 1, 2])
+        assert_equal(
+            _run(AsyncLinq([[1], (2, 3)]).select_many().to_list()),
+            [1, 2, 3])
+
+    def test_take(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(10)).skip(2).take(3).to_list()),
+            [2, 3, 4])
+        assert_equal(_run(AsyncLinq(_numbers(10)).take(0).to_list()), [])
+
+    @raises(IndexError)
+    def test_skip(self):
+        _run(AsyncLinq(_numbers(2)).skip(3).to_list())
+
+    def test_take_while(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(10))
+                 .skip_while(lambda n: n < 3)
+                 .take_while(lambda n: n < 6).to_list()),
+            [3, 4, 5])
+
+    def test_distinct(self):
+        assert_equal(
+            _run(AsyncLinq([1, 2, 1, 3]).distinct().to_list()),
+            [1, 2, 3])
+
+    def test_aggregates(self):
+        query = AsyncLinq(range(1, 6))
+        assert_equal(_run(query.count()), 5)
+        assert_equal(_run(query.count(lambda n: n > 2)), 3)
+        assert_equal(_run(query.sum(_square)), 55)
+        assert_equal(_run(query.average()), 3.0)
+        assert_equal(_run(query.min(lambda n: -n)), 5)
+        assert_equal(_run(query.max()), 5)
+        assert_equal(_run(query.first(lambda n: n > 3)), 4)
+        assert_equal(_run(query.first_or_default(lambda n: n > 9, 0)), 0)
+        assert_true(_run(query.any(lambda n: n == 2)))
+        assert_false(_run(query.all(lambda n: n < 5)))
+        assert_equal(_run(query.inject(0, lambda res, n: res + n)), 15)
+
+    @raises(IndexError)
+    def test_first(self):
+        _run(AsyncLinq([]).first())
+
+    @raises(IndexError)
+    def test_min(self):
+        _run(AsyncLinq([]).min())
+
+    def test_group_by(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(6)).group_by(lambda n: n % 2)),
+            IGroup([
+                IPair(0, Linq([0, 2, 4])),
+                IPair(1, Linq([1, 3, 5]))
+            ]))
+
+    def test_to_lookup(self):
+        assert_equal(
+            _run(AsyncLinq(_numbers(4)).to_lookup(
+                lambda n: n % 2, _square)),
+            ILookup({0: Linq([0, 4]), 1: Linq([1, 9])}))
+
+    def test_async_for(self):
+        async def collect():
+            return [n async for n in AsyncLinq(_numbers(3))]
+
+        assert_equal(_run(collect()), [0, 1, 2])
+
+    def test_str(self):
+        assert_equal(str(AsyncLinq()), 'AsyncLinq<...>')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import tempfile
+from nose.tools import assert_equal, raises
+from ilinq import iexternal
+from ilinq.iexternal import _Spill, _external_sort
+from ilinq.ilinq import Linq
+
+
+class TestSpill:
+    def test_iter(self):
+        spill = _Spill()
+        spill.extend(range(3000))
+        assert_equal(list(spill), list(range(3000)))
+        spill.close()
+
+    def test_spill_dir(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            spill = _Spill(spill_dir)
+            spill.append({'a': [1]})
+            assert_equal(list(spill), [{'a': [1]}])
+            spill.close()
+
+
+class TestExternalSort:
+    def test_order_by(self):
+        rand = random.Random(0)
+        items = Linq(rand.randrange(100) for _ in range(1000))
+        assert_equal(
+            items.order_by(memory_limit=30).to_list(),
+            sorted(items))
+        assert_equal(
+            items.order_by(desc=True, memory_limit=30).to_list(),
+            sorted(items, reverse=True))
+
+    def test_order_by_stable(self):
+        items = Linq((i % 7, i) for i in range(200))
+        assert_equal(
+            items.order_by(lambda x: x[0], desc=True, memory_limit=9)
+            .to_list(),
+            sorted(items, key=lambda x: x[0], reverse=True))
+
+    def test_then_by(self):
+        items = Linq((i % 5, str(i % 3), i) for i in range(300))
+        assert_equal(
+            items.lazy().order_by(lambda x: x[0], memory_limit=16)
+            .then_by_descending(lambda x: x[1]).to_list(),
+            items.order_by(lambda x: x[0])
+            .then_by_descending(lambda x: x[1]).to_list())
+
+    def test_many_runs(self):
+        max_runs = iexternal._MAX_RUNS
+        iexternal._MAX_RUNS = 3
+        try:
+            items = list(range(100, 0, -1))
+            assert_equal(
+                Linq(items).order_by(memory_limit=7).to_list(),
+                sorted(items))
+            items = Linq((i % 4, i) for i in range(300))
+            assert_equal(
+                items.order_by(lambda x: x[0], memory_limit=5).to_list(),
+                sorted(items, key=lambda x: x[0]))
+        finally:
+            iexternal._MAX_RUNS = max_runs
+
+    def test_spill_dir(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            query = Linq(range(50, 0, -1)).lazy() \
+                .order_by(spill_dir=spill_dir, memory_limit=10)
+            iterator = iter(query)
+            assert_equal(next(iterator), 1)
+            assert_equal(list(iterator), list(range(2, 51)))
+            assert_equal(os.listdir(spill_dir), [])
+
+    def test_in_memory(self):
+        assert_equal(
+            list(_external_sort(iter([3, 1, 2]), ((None, False),), 10, None)),
+            [1, 2, 3])
+
+    @raises(ValueError)
+    def test_memory_limit(self):
+        Linq([1]).order_by(memory_limit=0)
+
+
+class TestSpilledJoin:
+    def test_join(self):
+        rand = random.Random(0)
+        outers = Linq((rand.randrange(30), i) for i in range(200))
+        inners = Linq((rand.randrange(40), i) for i in range(300))
+        args = (
+            lambda x: x[0], lambda x: x[0], lambda x, y: (x[1], y[1]))
+        query = outers.join(inners, *args, partitions=7)
+        assert_equal(sorted(query), sorted(outers.join(inners, *args)))
+        assert_equal(query.count(), outers.join(inners, *args).count())
+
+    def test_join2(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            query = Linq(['a', 'b', 'c']).lazy().join(
+                ['bb', 'aa', 'a', 'dd'], lambda x: x, lambda y: y[0],
+                lambda x, y: x + y, spill_dir=spill_dir, partitions=1)
+            assert_equal(query.to_list(), ['aaa', 'aa', 'bbb'])
+
+    @raises(TypeError)
+    def test_unhashable(self):
+        Linq([[1]]).join(
+            [[1]], lambda x: x, lambda y: y, lambda x, y: x,
+            partitions=2).to_list()
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from nose.tools import assert_equal, raises
-from ilinq.igroup import IPair, IGroup
+from nose.tools import assert_equal, assert_is_instance, raises
+from ilinq.igroup import IPair, IGroup, LazyIGroup
 from ilinq.ilinq import Linq
 
 
@@ -90,3 +90,33 @@ class TestIGroup:
         assert_equal(
             str(group),
             'IGroup<{0: Linq<0, 1, 2>}, {1: Linq<0, 1, 3>}>')
+
+    def test_init5(self):
+        group = IGroup(IPair(n, Linq([n])) for n in range(3))
+        assert_equal(group.keys, [0, 1, 2])
+
+
+class TestLazyIGroup:
+    def test_group_by(self):
+        items = Linq(range(100))
+        group = items.group_by(lambda n: n % 7, partitions=3)
+        assert_is_instance(group, LazyIGroup)
+        assert_equal(
+            group.order_by(lambda pair: pair.key).to_list(),
+            items.group_by(lambda n: n % 7).order_by(lambda pair: pair.key))
+
+    def test_keys_values(self):
+        group = Linq(['ab', 'c', 'de']).lazy().group_by(len, partitions=1)
+        assert_equal(group.keys.to_list(), [2, 1])
+        assert_equal(
+            group.values.to_list(), [Linq(['ab', 'de']), Linq(['c'])])
+
+    def test_reiterable(self):
+        group = Linq(range(5)).group_by(lambda n: n % 2, spill_dir=None,
+                                        partitions=2)
+        assert_equal(group.count(), 2)
+        assert_equal(group.count(), 2)
+
+    @raises(ValueError)
+    def test_partitions(self):
+        Linq([1]).group_by(lambda n: n, partitions=0)
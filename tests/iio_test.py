@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bz2
+import gzip
+import lzma
+import os
+import sqlite3
+import tempfile
+from nose.tools import assert_equal, assert_true, raises
+from ilinq.ilazy import LazyLinq
+from ilinq.iio import IWriteResult
+from ilinq.ilinq import Linq
+
+
+class TestFromFiles:
+    def test_from_lines(self):
+        path = _write('a.txt', b'a\nb\r\n\nc')
+        linq = Linq.from_lines(path)
+        assert_equal(type(linq), LazyLinq)
+        assert_equal(linq.to_list(), ['a', 'b', '', 'c'])
+        assert_equal(linq.where(lambda x: x).take(2).to_list(), ['a', 'b'])
+
+    def test_from_lines2(self):
+        assert_equal(Linq.from_lines(_write('a.txt', b'')).count(), 0)
+
+    def test_encoding(self):
+        path = _write('a.txt', 'あ\nい\n'.encode('utf-16'))
+        assert_equal(
+            Linq.from_lines(path, encoding='utf-16').to_list(), ['あ', 'い'])
+        path = _write('b.txt', 'う\n'.encode('utf-8'))
+        assert_equal(Linq.from_lines(path).to_list(), ['う'])
+
+    def test_compression(self):
+        data = b'x\ny\n'
+        for suffix, opener in (
+                ('.gz', gzip.open), ('.bz2', bz2.open), ('.xz', lzma.open)):
+            path = _write('a.txt' + suffix, data, opener)
+            assert_equal(Linq.from_lines(path).to_list(), ['x', 'y'])
+        path = _write('a.dat', data, gzip.open)
+        assert_equal(
+            Linq.from_lines(path, compression='gzip').to_list(), ['x', 'y'])
+
+    def test_compression3(self):
+        data = b'x\ry\r\nz'
+        plain = Linq.from_lines(_write('a.txt', data)).to_list()
+        compressed = Linq.from_lines(_write('a.txt.gz', data, gzip.open))
+        assert_equal(plain, ['x', 'y', 'z'])
+        assert_equal(compressed.to_list(), plain)
+
+    @raises(ValueError)
+    def test_compression2(self):
+        Linq.from_lines(_write('a.txt', b''), compression='zip').count()
+
+    def test_from_csv(self):
+        path = _write('a.csv', b'id,name\r\n1,"a\nb"\r\n2,c\r\n')
+        assert_equal(
+            Linq.from_csv(path).to_list(),
+            [{'id': '1', 'name': 'a\nb'}, {'id': '2', 'name': 'c'}])
+        assert_equal(
+            Linq.from_csv(path, header=False).to_list(),
+            [('id', 'name'), ('1', 'a\nb'), ('2', 'c')])
+
+    def test_from_csv2(self):
+        path = _write('a.tsv.gz', b'1\t2\n3\t4\n', gzip.open)
+        assert_equal(
+            Linq.from_csv(path, header=False, delimiter='\t')
+            .select(lambda row: int(row[1])).sum(),
+            6)
+
+    def test_from_jsonl(self):
+        path = _write('a.jsonl', b'{"a": 1}\n\n[2]\n')
+        linq = Linq.from_jsonl(path)
+        assert_equal(linq.to_list(), [{'a': 1}, [2]])
+        assert_equal(linq.to_list(), [{'a': 1}, [2]])
+
+
+class TestSinks:
+    def test_to_csv(self):
+        path = _path('b.csv')
+        rows = Linq([{'id': 1, 'name': 'a\nb'}, {'id': 2, 'name': 'c'}])
+        result = rows.to_csv(path)
+        assert_equal(result.rows, 2)
+        assert_equal(Linq.from_csv(path).to_list(), [
+            {'id': '1', 'name': 'a\nb'}, {'id': '2', 'name': 'c'}])
+        rows.to_csv(path, header=['name', 'id'])
+        assert_equal(
+            Linq.from_csv(path, header=False).first(), ('name', 'id'))
+
+    def test_to_csv2(self):
+        path = _path('b.tsv.bz2')
+        result = Linq.range(1000).lazy().select(lambda n: (n, n * n)) \
+            .to_csv(path, header=['n', 'square'], delimiter='\t')
+        assert_equal(result.rows, 1000)
+        assert_equal(
+            Linq.from_csv(path, delimiter='\t').last(),
+            {'n': '999', 'square': '998001'})
+
+    def test_to_csv3(self):
+        path = _path('c.csv')
+        assert_equal(Linq([]).to_csv(path).rows, 0)
+        assert_equal(Linq.from_lines(path).count(), 0)
+
+    def test_to_jsonl(self):
+        path = _path('b.jsonl.gz')
+        items = [{'a': 'あ'}, [1, None], None]
+        assert_equal(Linq(items).lazy().to_jsonl(path).rows, 3)
+        assert_equal(Linq.from_jsonl(path).to_list(), items)
+
+    def test_to_sqlite(self):
+        path = _path('b.db')
+        result = Linq.range(25).select(lambda n: {'n': n, 's': str(n)}) \
+            .to_sqlite(path, 'numbers', batch_size=10)
+        assert_equal(result.rows, 25)
+        conn = sqlite3.connect(path)
+        assert_equal(
+            conn.execute('SELECT COUNT(*), SUM(n) FROM numbers').fetchone(),
+            (25, 300))
+        conn.close()
+
+    def test_to_sqlite2(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE t (a, b)')
+        Linq([(1, 2), (3, 4)]).lazy().to_sqlite(conn, 't')
+        Linq([(5, 6)]).to_sqlite(conn, 't', columns=['b', 'a'])
+        assert_equal(
+            conn.execute('SELECT a, b FROM t').fetchall(),
+            [(1, 2), (3, 4), (6, 5)])
+
+    def test_to_sqlite3(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE t (a UNIQUE)')
+        raised = False
+        try:
+            Linq([(1,), (2,), (1,)]).to_sqlite(conn, 't', batch_size=1)
+        except sqlite3.IntegrityError:
+            raised = True
+        assert_true(raised)
+        assert_equal(conn.execute('SELECT COUNT(*) FROM t').fetchone(), (0,))
+
+    def test_result(self):
+        result = IWriteResult(10, 2.0)
+        assert_equal(result.rows_per_second, 5.0)
+        assert_equal(
+            str(result),
+            'IWriteResult<rows: 10, seconds: 2.0, rows_per_second: 5.0>')
+        assert_true(IWriteResult(0, 0.0).rows_per_second == 0.0)
+
+
+_DIR = tempfile.TemporaryDirectory()
+
+
+def _path(name):
+    return os.path.join(_DIR.name, name)
+
+
+def _write(name, data, opener=open):
+    path = _path(name)
+    with opener(path, 'wb') as f:
+        f.write(data)
+    return path
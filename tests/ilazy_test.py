@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import random
+from nose.tools import (
+    assert_equal, assert_true, assert_false, raises, assert_is_instance)
+from ilinq.ilinq import Linq
+from ilinq.igroup import IPair, LazyIGroup
+from ilinq.ilazy import LazyLinq, OrderedLazyLinq, SortedLazyLinq, _fuse
+
+
+class TestLazyLinq:
+
+    def test_lazy(self):
+        assert_is_instance(Linq([1, 2]).lazy(), LazyLinq)
+
+    def test_deferred(self):
+        called = list()
+
+        def f(x):
+            called.append(x)
+            return x * 2
+
+        query = Linq(range(10)).lazy().select(f)
+        assert_equal(called, [])
+        assert_equal(query.take(3).to_list(), [0, 2, 4])
+        assert_equal(called, [0, 1, 2])
+
+    def test_reiterable(self):
+        query = Linq(range(5)).lazy().where(lambda x: x % 2 == 0)
+        assert_equal(query.to_list(), [0, 2, 4])
+        assert_equal(query.to_list(), [0, 2, 4])
+
+    def test_where_select(self):
+        assert_equal(
+            Linq(range(10)).lazy()
+            .where(lambda x: x % 3 == 0)
+            .select(lambda x: x * x)
+            .to_linq(),
+            Linq([0, 9, 36, 81]))
+
+    def test_select_i(self):
+        assert_equal(
+            Linq([4, 3, 2, 1, 0]).lazy()
+            .select_i(lambda i, x: x ** i).to_list(),
+            [1, 3, 4, 1, 0])
+
+    def test_select_many(self):
+        assert_equal(
+            Linq([[0, 1], (2, 3), Linq([4])]).lazy().select_many().to_list(),
+            [0, 1, 2, 3, 4])
+
+    def test_take_while_i(self):
+        linq = Linq(range(10)).concat(Linq(range(10)).reverse())
+        assert_equal(
+            linq.lazy().take_while_i(lambda i, x: i * x <= 10).to_list(),
+            [0, 1, 2, 3])
+
+    def test_skip(self):
+        assert_equal(Linq(range(5)).lazy().skip(5).to_list(), [])
+
+    @raises(IndexError)
+    def test_skip2(self):
+        Linq(range(2)).lazy().skip(5).to_list()
+
+    def test_skip_while_i(self):
+        assert_equal(
+            Linq(range(10)).lazy()
+            .skip_while_i(lambda i, x: i * x < 10).to_list(),
+            [4, 5, 6, 7, 8, 9])
+
+    def test_concat(self):
+        assert_equal(
+            Linq([1, 2]).lazy().concat([3], Linq([4, 5])).to_list(),
+            [1, 2, 3, 4, 5])
+
+    def test_default_if_empty(self):
+        assert_equal(Linq([]).lazy().default_if_empty(3).to_list(), [3])
+        assert_equal(Linq([1]).lazy().default_if_empty(3).to_list(), [1])
+
+    def test_distinct(self):
+        assert_equal(
+            Linq([-1, 2, 1, 2, 3, -1]).lazy()
+            .distinct(lambda x: x * x).to_list(),
+            [-1, 2, 3])
+
+    def test_set_operators(self):
+        linq1 = Linq([1, 2, -3, -4, -5, 2])
+        linq2 = Linq([2, 3, 5, 7, 6])
+        for name in ('except_', 'intersect', 'union'):
+            for key_f in (None, abs):
+                query = getattr(linq1.lazy(), name)(linq2, key_f)
+                assert_equal(type(query), LazyLinq)
+                assert_equal(
+                    query.to_list(), getattr(linq1, name)(linq2, key_f))
+
+    def test_set_operators2(self):
+        other = Linq([1])
+        query = Linq([1, 2]).lazy().except_(other)
+        other.append(2)
+        assert_equal(query.to_list(), [])
+
+    def test_order_by(self):
+        assert_equal(
+            Linq([3, 1, 2]).lazy().order_by(desc=True).to_list(),
+            [3, 2, 1])
+
+    def test_order_by2(self):
+        query = Linq([3, 1, 2]).lazy().where(lambda x: x > 1).order_by()
+        assert_is_instance(query, OrderedLazyLinq)
+        assert_equal(query.to_list(), [2, 3])
+        assert_equal(query.select(lambda x: x * 10).to_list(), [20, 30])
+
+    def test_order_by_take(self):
+        items = Linq([(1, 'a'), (2, 'b'), (1, 'c'), (2, 'd')])
+        query = items.lazy().order_by(lambda x: x[0], desc=True).take(3)
+        assert_equal(query.to_list(), [(2, 'b'), (2, 'd'), (1, 'a')])
+
+    def test_then_by(self):
+        items = Linq([(1, 'b'), (0, 'c'), (1, 'a'), (0, 'd')])
+        query = items.lazy().order_by(lambda x: x[0], desc=True) \
+            .then_by(lambda x: x[1])
+        assert_is_instance(query, OrderedLazyLinq)
+        assert_equal(
+            query.to_list(), [(1, 'a'), (1, 'b'), (0, 'c'), (0, 'd')])
+        assert_equal(query.take(3).to_list(), [(1, 'a'), (1, 'b'), (0, 'c')])
+        query = items.lazy().order_by(lambda x: x[0]) \
+            .then_by_descending(lambda x: x[1])
+        assert_equal(query.take(3).to_list(), [(0, 'd'), (0, 'c'), (1, 'b')])
+
+    def test_top_bottom(self):
+        query = Linq([3, 1, 4, 1, 5]).lazy()
+        assert_equal(query.top(2).to_list(), [1, 1])
+        assert_equal(query.bottom(2).to_list(), [4, 5])
+
+    def test_aggregates(self):
+        query = Linq(range(1, 6)).lazy()
+        assert_equal(query.sum(), 15)
+        assert_equal(query.count(lambda x: x > 3), 2)
+        assert_equal(query.min(), 1)
+        assert_equal(query.max(), 5)
+        assert_equal(query.average(), 3.0)
+        assert_equal(query.average(lambda x: x * 1j), 3j)
+        assert_equal(query.stats().variance, 2.0)
+        assert_equal(query.first(lambda x: x > 3), 4)
+        assert_equal(query.last(lambda x: x < 3), 2)
+        assert_equal(query.element_at(1), 2)
+        assert_true(query.any(lambda x: x == 5))
+        assert_false(query.all(lambda x: x < 5))
+        assert_true(query.contains(3))
+
+    def test_single(self):
+        assert_equal(Linq([1, 2, 3]).lazy().single(lambda x: x > 2), 3)
+        assert_equal(Linq([1]).lazy().single_or_default(), 1)
+        assert_equal(Linq([]).lazy().single_or_default(5), 5)
+
+    @raises(IndexError)
+    def test_single2(self):
+        Linq([1, 2, 3]).lazy().single(lambda x: x > 1)
+
+    @raises(IndexError)
+    def test_last(self):
+        Linq([1, 2, 3]).lazy().last(lambda x: x > 5)
+
+    def test_min_max_all(self):
+        query = Linq([3, 1, 4, 1, 5, 5]).lazy()
+        assert_equal(query.min_all(), Linq([1, 1]))
+        assert_equal(query.max_all(), Linq([5, 5]))
+        assert_equal(query.argmin(), 1)
+        assert_equal(query.argmax(), 4)
+
+    def test_first_stops_early(self):
+        called = list()
+
+        def f(x):
+            called.append(x)
+            return x > 1
+
+        assert_equal(Linq(range(100)).lazy().first(f), 2)
+        assert_equal(called, [0, 1, 2])
+
+    @raises(IndexError)
+    def test_element_at(self):
+        Linq([1]).lazy().element_at(1)
+
+    def test_iter(self):
+        assert_equal(list(Linq([1, 2]).lazy()), [1, 2])
+
+    def test_str(self):
+        assert_equal(str(Linq([1]).lazy()), 'LazyLinq<...>')
+
+    def test_fuse(self):
+        query = Linq(range(10)).lazy() \
+            .where(lambda x: x % 2 == 0).select(lambda x: x * 3).take(2) \
+            .select_many().where(lambda x: x > 0).select(str).skip(1)
+        assert_equal(
+            [len(args) for _, args in _fuse(query._stages)],
+            [3, 1, 3])
+
+    def test_fuse2(self):
+        operators = [
+            ('where', lambda x: x % 3 != 0),
+            ('where', None),
+            ('select', lambda x: x + 1),
+            ('select', None),
+            ('select_i', lambda i, x: x + i),
+            ('select_i', None),
+            ('take', 0),
+            ('take', 7),
+            ('take_while', lambda x: x < 30),
+            ('take_while', None),
+            ('skip', 2),
+            ('skip', 40),
+        ]
+        rand = random.Random(0)
+        for _ in range(2000):
+            query = Linq(range(rand.randrange(20))).lazy()
+            for _ in range(rand.randrange(1, 6)):
+                name, arg = rand.choice(operators)
+                query = getattr(query, name)(arg)
+            assert_equal(_run(query, fuse=True), _run(query, fuse=False))
+
+    def test_fuse3(self):
+        called = list()
+
+        def f(x):
+            called.append(x)
+            return x
+
+        query = Linq(range(10)).lazy().select(f).where(lambda x: x > 0)
+        assert_equal(query.take(2).to_list(), [1, 2])
+        assert_equal(called, [0, 1, 2])
+
+
+class TestSortedLazyLinq:
+
+    def test_assume_sorted(self):
+        query = Linq([1, 2, 3]).assume_sorted()
+        assert_is_instance(query, SortedLazyLinq)
+        assert_is_instance(query.where(lambda x: x > 1), SortedLazyLinq)
+        assert_is_instance(query.take(2).skip(1), SortedLazyLinq)
+        assert_equal(query.where(lambda x: x > 1).to_list(), [2, 3])
+
+    def test_distinct(self):
+        items = Linq([(0, 'a'), (0, 'b'), (1, 'a'), (3, 'c'), (3, 'c')])
+        query = items.assume_sorted(lambda x: x[0])
+        assert_equal(
+            query.distinct().to_list(), [(0, 'a'), (1, 'a'), (3, 'c')])
+        assert_equal(
+            query.distinct(lambda x: x[1]).to_list(),
+            [(0, 'a'), (0, 'b'), (1, 'a'), (3, 'c')])
+
+    def test_group_by(self):
+        called = list()
+
+        def items():
+            for n in [1, 1, 2, 5, 5, 5]:
+                called.append(n)
+                yield n
+
+        group = LazyLinq(items()).assume_sorted().group_by()
+        assert_is_instance(group, LazyIGroup)
+        iterator = iter(group)
+        assert_equal(next(iterator), IPair(1, Linq([1, 1])))
+        assert_equal(called, [1, 1, 2])
+        assert_equal(
+            list(iterator), [IPair(2, Linq([2])), IPair(5, Linq([5, 5, 5]))])
+
+    def test_join(self):
+        rand = random.Random(0)
+        for _ in range(200):
+            outers = Linq(sorted(
+                (rand.randrange(10), i) for i in range(rand.randrange(15))))
+            inners = Linq(sorted(
+                (rand.randrange(10), i) for i in range(rand.randrange(15))))
+            args = (lambda x: x[0], lambda x: x[0], lambda x, y: (x, y))
+            assert_equal(
+                outers.assume_sorted().join(inners, *args).to_list(),
+                list(outers.join(inners, *args)))
+
+    def test_join2(self):
+        outers = Linq(['d', 'cc', 'b', 'a']).assume_sorted(desc=True)
+        inners = Linq(['dx', 'dy', 'bx', 'ax']).assume_sorted(
+            lambda y: y[0], desc=True)
+        assert_equal(
+            outers.join(inners).to_list(),
+            [('d', 'dx'), ('d', 'dy'), ('b', 'bx'), ('a', 'ax')])
+        assert_equal(
+            outers.join(inners, lambda x: x[0], select_f=lambda x, y: x + y)
+            .to_list(),
+            ['ddx', 'ddy', 'bbx', 'aax'])
+
+    def test_spill_args(self):
+        query = Linq([(0, 'a'), (0, 'b'), (1, 'c')]).assume_sorted(
+            lambda x: x[0])
+        assert_equal(
+            query.group_by(partitions=2).select(lambda pair: pair.key)
+            .to_list(),
+            [0, 1])
+        assert_equal(
+            query.join([(1, 'd')], val_f=lambda y: y[0], spill_dir=None,
+                       partitions=2).to_list(),
+            [((1, 'c'), (1, 'd'))])
+
+
+def _run(query, fuse):
+    iterator = iter(query._source)
+    stages = _fuse(query._stages) if fuse else query._stages
+    for gen_f, args in stages:
+        iterator = gen_f(iterator, *args)
+    try:
+        return list(iterator)
+    except IndexError:
+        return IndexError
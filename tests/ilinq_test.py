@@ -3,7 +3,9 @@
 
 from nose.tools import (
     assert_equal, assert_true, assert_false, raises, assert_is_instance)
-from ilinq.ilinq import Linq
+import json
+import pickle
+from ilinq.ilinq import Linq, LinqView, OrderedLinq
 from ilinq.igroup import IPair, IGroup
 from ilinq.ilookup import ILookup
 
@@ -34,6 +36,25 @@ class TestLinq:
                 key_f=lambda x: x % 5),
             Linq([1, 3, 6, 8]))
 
+    def test_where_in3(self):
+        probe = Linq([1, 3, 7]).to_probe()
+        assert_equal(Linq(range(5)).where_in(probe), Linq([1, 3]))
+        assert_equal(Linq(range(5, 10)).where_in(probe), Linq([7]))
+
+    def test_where_in4(self):
+        assert_equal(
+            Linq(range(10)).where_in(
+                ILookup({1: Linq([1]), 8: Linq([8])})),
+            Linq([1, 8]))
+        assert_equal(
+            Linq(range(10)).where_in(frozenset([2, 4])),
+            Linq([2, 4]))
+
+    def test_where_in5(self):
+        assert_equal(
+            Linq([[1], [2], [3]]).where_in([[3], [1]]),
+            Linq([[1], [3]]))
+
     def test_select(self):
         linq = Linq(range(5))
         assert_equal(
@@ -82,6 +103,16 @@ class TestLinq:
             linq.select_many(),
             Linq(range(10)))
 
+    def test_select_many3(self):
+        linq = Linq([(0, 1), [2], Linq([3, 4]), range(5, 7), []])
+        assert_equal(linq.select_many(), Linq(range(7)))
+        assert_equal(
+            linq.select_many(lambda xs: (x * 2 for x in xs)),
+            Linq(range(0, 14, 2)))
+
+    def test_select_many4(self):
+        assert_equal(Linq().select_many(), Linq())
+
     def test_select_many_i(self):
         linq = Linq(
             [
@@ -115,6 +146,9 @@ class TestLinq:
         linq = Linq([1, 2])
         assert_equal(linq.take(5), Linq([1, 2]))
 
+    def test_take3(self):
+        assert_equal(Linq([1, 2]).take(-1), Linq([]))
+
     def test_take_while(self):
         assert_equal(
             Linq(range(10)).take_while(lambda x: x < 5),
@@ -151,6 +185,15 @@ class TestLinq:
             Linq(range(10)).concat(Linq(range(10)).reverse())
         )
 
+    def test_take_while_i4(self):
+        linq = Linq(range(10 ** 6))
+        assert_equal(
+            linq.take_while_i(lambda i, x: i < 10 ** 6 - 1).count(),
+            10 ** 6 - 1)
+        assert_equal(
+            linq.skip_while_i(lambda i, x: i < 10 ** 6 - 1),
+            Linq([10 ** 6 - 1]))
+
     def test_skip(self):
         assert_equal(
             Linq(range(10)).reverse().skip(3),
@@ -204,6 +247,11 @@ class TestLinq:
         assert_equal(linq1, Linq([1, 2]))
         assert_equal(linq2, Linq([3, 4]))
 
+    def test_concat3(self):
+        linq = Linq([1]).concat((2, 3), [4], (n for n in [5, 6]))
+        assert_equal(linq, Linq([1, 2, 3, 4, 5, 6]))
+        assert_is_instance(linq, Linq)
+
     def test_default_if_empty(self):
         linq = Linq([1, 2])
         assert_equal(linq.default_if_empty(), Linq([1, 2]))
@@ -221,6 +269,16 @@ class TestLinq:
         linq = Linq([-1, 2, 1, 2, 3, -1, 2, 1])
         assert_equal(linq.distinct(lambda x: x*x), Linq([-1, 2, 3]))
 
+    def test_distinct3(self):
+        linq = Linq([[1], 2, [1], {'a': 1}, 2, {'a': 1}, [2]])
+        assert_equal(linq.distinct(), Linq([[1], 2, {'a': 1}, [2]]))
+
+    def test_distinct4(self):
+        linq = Linq([{'id': 3}, {'id': 1}, {'id': 3}])
+        assert_equal(
+            linq.distinct(lambda x: x['id']),
+            Linq([{'id': 3}, {'id': 1}]))
+
     def test_except(self):
         linq1 = Linq([2.0, 2.0, 2.1, 2.2, 2.3, 2.4, 2.5])
         linq2 = Linq([2.1, 2.2])
@@ -233,6 +291,15 @@ class TestLinq:
                 linq2, key_f=lambda x: abs(x)),
             Linq([2.0, -2.0, 2.3, 2.4, 2.5, 2.3]))
 
+    def test_except3(self):
+        linq1 = Linq([1, 2, -3, -4, -5])
+        linq2 = Linq([-2, 3, 5])
+        assert_equal(linq1.except_(linq2, key_f=abs), Linq([1, -4]))
+
+    def test_except4(self):
+        linq1 = Linq([[1], [2], [3]])
+        assert_equal(linq1.except_([[2]]), Linq([[1], [3]]))
+
     def test_intersect(self):
         linq1 = Linq([2.0, -2.0, 2.1, -2.2, 2.3, 2.4, 2.5, 2.3, 2.1])
         linq2 = Linq([2.1, 2.2, 2.1])
@@ -273,6 +340,11 @@ class TestLinq:
             Linq([1, 2, -3]).union(Linq([3, 4, 5, 4, -2]), key_f=abs),
             Linq([1, 2, -3, 4, 5]))
 
+    def test_union5(self):
+        assert_equal(
+            Linq([[1], [2], [1]]).union([[2], [3]]),
+            Linq([[1], [2], [3]]))
+
     def test_zip(self):
         assert_equal(
             Linq([1, 2, 3]).zip([4, 5, 6], zip_f=lambda x, y: x + y),
@@ -311,6 +383,11 @@ class TestLinq:
         assert_equal(linq, Linq([5, 4, 3, 2, 1, 0]))
         assert_is_instance(linq, Linq)
 
+    def test_reverse2(self):
+        linq = Linq(range(3))
+        assert_equal(linq.reverse().reverse(), linq)
+        assert_equal(linq, Linq([0, 1, 2]))
+
     def test_order_by(self):
         items = [
             {'x': 1, 'y': 2},
@@ -337,6 +414,114 @@ class TestLinq:
             Linq([{'x': 3, 'y': 4}, {'x': 1, 'y': 2}, {'x': 1, 'y': 1}])
         )
 
+    def test_order_by2(self):
+        linq = Linq([3, 1, 2]).order_by()
+        assert_is_instance(linq, OrderedLinq)
+        assert_equal(linq, Linq([1, 2, 3]))
+        assert_equal(str(linq), 'OrderedLinq<1, 2, 3>')
+
+    def test_order_by_stable(self):
+        items = Linq([(1, 'a'), (0, 'b'), (1, 'c'), (0, 'd')])
+        assert_equal(
+            items.order_by(lambda x: x[0], desc=True),
+            Linq([(1, 'a'), (1, 'c'), (0, 'b'), (0, 'd')]))
+
+    def test_then_by(self):
+        items = Linq([
+            {'name': 'b', 'age': 23, 'id': 1},
+            {'name': 'c', 'age': 21, 'id': 2},
+            {'name': 'a', 'age': 23, 'id': 3},
+            {'name': 'a', 'age': 23, 'id': 4},
+            {'name': 'd', 'age': 21, 'id': 5},
+        ])
+        linq = items.order_by(lambda p: p['age'], desc=True) \
+            .then_by(lambda p: p['name'])
+        assert_is_instance(linq, OrderedLinq)
+        assert_equal(linq.select(lambda p: p['id']), Linq([3, 4, 1, 2, 5]))
+        assert_equal(
+            items.order_by(lambda p: p['age'])
+            .then_by_descending(lambda p: p['name'])
+            .then_by_descending(lambda p: p['id'])
+            .select(lambda p: p['id']),
+            Linq([5, 2, 1, 4, 3]))
+
+    def test_then_by2(self):
+        called = list()
+
+        def key_f(x):
+            called.append(x)
+            return x % 3
+
+        linq = Linq(range(6)).order_by(key_f).then_by_descending(lambda x: x)
+        assert_equal(linq, Linq([3, 0, 4, 1, 5, 2]))
+        assert_equal(called, list(range(6)))
+        linq.then_by(key_f).then_by(key_f)
+        assert_equal(called, list(range(6)) + [3, 0, 4, 1, 5, 2] * 2)
+
+    def test_then_by4(self):
+        called = list()
+
+        def key_f(x):
+            called.append(x)
+            return -x
+
+        linq = Linq([3, 1, 2]).order_by(key_f)
+        linq.append(0)
+        assert_equal(linq.then_by(), Linq([3, 2, 1, 0]))
+        assert_equal(called, [3, 1, 2, 0])
+
+    def test_then_by5(self):
+        linq = Linq([3, 1, 2]).order_by()
+        linq.remove(1)
+        linq[0] = 5
+        assert_equal(linq.then_by(), Linq([3, 5]))
+        linq.clear()
+        assert_equal(linq.then_by(), Linq([]))
+
+    def test_then_by3(self):
+        assert_equal(
+            Linq(['bb', 'a', 'ab', 'c']).order_by(len, desc=True)
+            .then_by(desc=True),
+            Linq(['bb', 'ab', 'c', 'a']))
+
+    def test_top(self):
+        linq = Linq([3, 1, 4, 1, 5, 9, 2, 6])
+        assert_equal(linq.top(3), Linq([1, 1, 2]))
+        assert_equal(linq.top(3, desc=True), Linq([9, 6, 5]))
+        assert_equal(linq.top(100), linq.order_by())
+        assert_equal(linq.top(0), Linq())
+
+    def test_top2(self):
+        items = Linq([
+            {'x': 1, 'n': 'a'},
+            {'x': 2, 'n': 'b'},
+            {'x': 1, 'n': 'c'},
+            {'x': 2, 'n': 'd'},
+        ])
+        for num in range(5):
+            for desc in (False, True):
+                assert_equal(
+                    items.top(num, lambda obj: obj['x'], desc),
+                    items.order_by(lambda obj: obj['x'], desc).take(num))
+
+    def test_bottom(self):
+        linq = Linq([3, 1, 4, 1, 5, 9, 2, 6])
+        assert_equal(linq.bottom(3), Linq([5, 6, 9]))
+        assert_equal(linq.bottom(3, desc=True), Linq([2, 1, 1]))
+
+    def test_bottom2(self):
+        items = Linq([
+            {'x': 1, 'n': 'a'},
+            {'x': 2, 'n': 'b'},
+            {'x': 1, 'n': 'c'},
+            {'x': 2, 'n': 'd'},
+        ])
+        for num in range(1, 5):
+            for desc in (False, True):
+                assert_equal(
+                    items.bottom(num, lambda obj: obj['x'], desc),
+                    items.order_by(lambda obj: obj['x'], desc)[-num:])
+
     def test_scan(self):
         linq = Linq([1, 2, 3, 4]).scan(0, lambda res, val: res - val)
         assert_equal(
@@ -418,6 +603,44 @@ class TestLinq:
             ])
         )
 
+    def test_join3(self):
+        numbers = Linq(range(10))
+        assert_equal(
+            numbers.join(
+                [3, 1, 3],
+                lambda n: n,
+                lambda m: m,
+                lambda n, m: (n, m)),
+            Linq([(1, 1), (3, 3), (3, 3)]))
+        assert_equal(
+            Linq([3, 1, 3]).join(
+                numbers,
+                lambda m: m,
+                lambda n: n % 5,
+                lambda m, n: (m, n)),
+            Linq([(3, 3), (3, 8), (1, 1), (1, 6), (3, 3), (3, 8)]))
+
+    def test_join4(self):
+        persons = Linq([{"id": [1]}, {"id": [2]}])
+        dogs = Linq([{"owner": [2]}, {"owner": [1]}, {"owner": [2]}])
+        assert_equal(
+            persons.join(
+                dogs,
+                lambda p: p["id"],
+                lambda d: d["owner"],
+                lambda p, d: (p["id"][0], d["owner"][0])),
+            Linq([(1, 1), (2, 2), (2, 2)]))
+
+    def test_join5(self):
+        called = list()
+
+        def val_f(n):
+            called.append(n)
+            return n
+
+        Linq(range(10)).join(range(20), lambda n: n, val_f, lambda n, m: n)
+        assert_equal(called, list(range(20)))
+
     def test_group_join(self):
         persons = Linq([
             {"name": "person1", "person_id": 1},
@@ -474,6 +697,32 @@ class TestLinq:
             ])
         )
 
+    def test_group_join3(self):
+        called = list()
+
+        def value_f(n):
+            called.append(n)
+            return n % 3
+
+        assert_equal(
+            Linq([0, 1, 0, 5]).group_join(
+                range(6), lambda n: n, value_f, lambda n, ms: (n, ms)),
+            Linq([
+                (0, Linq([0, 3])),
+                (1, Linq([1, 4])),
+                (0, Linq([0, 3])),
+                (5, Linq())]))
+        assert_equal(called, list(range(6)))
+
+    def test_group_join4(self):
+        assert_equal(
+            Linq([[1], [2]]).group_join(
+                [[1], [3], [1]],
+                lambda n: n,
+                lambda m: m,
+                lambda n, ms: ms.count()),
+            Linq([2, 0]))
+
     def test_count(self):
         assert_equal(Linq([2, 4, 6, 8, 10]).count(), 5)
 
@@ -502,6 +751,23 @@ class TestLinq:
         linq = Linq([1, 1, 2, 3, 5])
         assert_equal(linq.single(cond_f=lambda x: x % 2 == 0), 2)
 
+    @raises(IndexError)
+    def test_single5(self):
+        Linq([1, 2, 3]).single()
+
+    def test_single6(self):
+        called = list()
+
+        def cond_f(x):
+            called.append(x)
+            return x > 1
+
+        try:
+            Linq(range(10)).single(cond_f)
+        except IndexError:
+            pass
+        assert_equal(called, [0, 1, 2, 3])
+
     def test_single_or_default(self):
         linq = Linq([1])
         assert_equal(linq.single_or_default(), 1)
@@ -601,6 +867,10 @@ class TestLinq:
         linq = Linq([])
         linq.element_at(2)
 
+    @raises(IndexError)
+    def test_element_at4(self):
+        Linq([11, 13]).element_at(-1)
+
     def test_element_at_or_default(self):
         linq = Linq([11, 13, 15, 19])
         assert_equal(linq.element_at_or_default(2), 15)
@@ -647,6 +917,34 @@ class TestLinq:
     def test_max_all3(self):
         assert_equal(Linq().max_all(), Linq())
 
+    def test_max_all4(self):
+        called = list()
+
+        def key_f(x):
+            called.append(x)
+            return x % 3
+
+        assert_equal(Linq(range(6)).max_all(key_f), Linq([2, 5]))
+        assert_equal(called, list(range(6)))
+
+    def test_argmin(self):
+        linq = Linq([3, -4, 2, -4])
+        assert_equal(linq.argmin(), 1)
+        assert_equal(linq.argmin(abs), 2)
+
+    @raises(StopIteration)
+    def test_argmin2(self):
+        Linq().argmin()
+
+    def test_argmax(self):
+        linq = Linq([3, -4, 2, -4])
+        assert_equal(linq.argmax(), 0)
+        assert_equal(linq.argmax(abs), 1)
+
+    @raises(StopIteration)
+    def test_argmax2(self):
+        Linq().argmax()
+
     @raises(StopIteration)
     def test_min3(self):
         linq = Linq([])
@@ -696,6 +994,10 @@ class TestLinq:
         linq = Linq([])
         linq.average()
 
+    def test_average4(self):
+        linq = Linq([1j, 2j])
+        assert_equal(linq.average(), 1.5j)
+
     def test_std(self):
         val = Linq([71, 80, 89, 80, 54]).std()
         assert_true(val < 7.35 - 0.0001 or val > 7.35 + 0.0001)
@@ -710,6 +1012,19 @@ class TestLinq:
         val = linq.std(key_f=lambda obj: obj["math"])
         assert_true(val < 7.35 - 0.0001 or val > 7.35 + 0.0001)
 
+    def test_std3(self):
+        val = Linq([71, 80, 89, 80, 54]).std()
+        assert_true(abs(val - 11.8558) < 0.0001)
+
+    def test_stats(self):
+        stats = Linq([{'age': 20}, {'age': 30}]).stats(lambda x: x['age'])
+        assert_equal(stats.count, 2)
+        assert_equal(stats.sum, 50)
+        assert_equal(stats.mean, 25.0)
+        assert_equal(stats.std, 5.0)
+        assert_equal(stats.min, 20)
+        assert_equal(stats.max, 30)
+
     def test_contain(self):
         linq = Linq([1, 6, 1, 4, 2, 2])
         assert_true(linq.contains(2))
@@ -725,6 +1040,12 @@ class TestLinq:
         assert_true(linq.contains(101, key_f=lambda n: n % 100))
         assert_false(linq.contains(100, key_f=lambda n: n % 100))
 
+    def test_contain4(self):
+        nan = float('nan')
+        assert_true(Linq([nan]).contains(nan))
+        assert_true(Linq([[nan]]).contains([nan], key_f=lambda x: x[0]))
+        assert_true(Linq([nan]).lazy().contains(nan))
+
     def test_all(self):
         linq = Linq([1, 1, 3, 4, 5, 7, 9, 11])
         assert_false(linq.all(lambda x: x % 2 == 1))
@@ -755,6 +1076,36 @@ class TestLinq:
         assert_false(linq.any(cond_f=lambda x: x > 10))
         assert_false(linq.any(cond_f=lambda x: x > 10))
 
+    def test_any5(self):
+        called = list()
+
+        def cond_f(x):
+            called.append(x)
+            return x == 2
+
+        assert_true(Linq(range(10)).any(cond_f))
+        assert_equal(called, [0, 1, 2])
+
+    def test_all3(self):
+        called = list()
+
+        def cond_f(x):
+            called.append(x)
+            return x < 2
+
+        assert_false(Linq(range(10)).all(cond_f))
+        assert_equal(called, [0, 1, 2])
+
+    def test_last4(self):
+        called = list()
+
+        def cond_f(x):
+            called.append(x)
+            return x % 4 == 0
+
+        assert_equal(Linq(range(10)).last(cond_f), 8)
+        assert_equal(called, [9, 8])
+
     def test_group_by(self):
         linq = Linq(range(6))
         assert_equal(
@@ -813,6 +1164,11 @@ class TestLinq:
         assert_equal(Linq([1]).to_list(), [1])
         assert_equal(Linq([1, 1, 2, 3, 5]).to_list(), [1, 1, 2, 3, 5])
 
+    def test_to_probe(self):
+        probe = Linq([{'id': 1}, {'id': 3}]).to_probe(lambda x: x['id'])
+        assert_true(3 in probe)
+        assert_false(2 in probe)
+
     def test_copy(self):
         linq = Linq(range(10))
         linq_copied = linq.copy()
@@ -844,6 +1200,15 @@ class TestLinq:
     def test_to_dict4(self):
         Linq(range(4)).to_dict(key_f=lambda _: 1)
 
+    def test_add2(self):
+        linq = Linq([1, 2, 3])
+        assert_equal(linq.skip(1) + linq.take(1), Linq([2, 3, 1]))
+        assert_equal([0] + linq.reverse(), Linq([0, 3, 2, 1]))
+
+    @raises(TypeError)
+    def test_add3(self):
+        Linq([1]) + (2,)
+
     def test_add(self):
         linq1 = Linq([1, 2])
         linq2 = Linq([3, 4])
@@ -877,3 +1242,156 @@ class TestLinq:
 
     def test_repr2(self):
         assert_equal(repr(Linq([1, 2])), 'Linq<1, 2>')
+
+
+class TestLinqView:
+    def test_init(self):
+        linq = Linq(range(10))
+        view = linq.view(8, 1, -3)
+        assert_is_instance(view, LinqView)
+        assert_equal(view, Linq([8, 5, 2]))
+        assert_equal(view, [8, 5, 2])
+        assert_equal(list(view), [8, 5, 2])
+        assert_equal(len(view), 3)
+        assert_equal(view[-1], 2)
+        assert_equal(list(reversed(view)), [2, 5, 8])
+        assert_true(5 in view)
+        assert_false(6 in view)
+
+    def test_view(self):
+        linq = Linq(range(10))
+        view = linq.view(1, 9).skip(2).take(4).reverse()
+        assert_is_instance(view, LinqView)
+        assert_equal(view, Linq([6, 5, 4, 3]))
+        assert_true(view._parent is linq)
+        assert_equal(view.view(step=2), Linq([6, 4]))
+
+    def test_parent(self):
+        linq = Linq(range(5))
+        view = linq.view(0, 2)
+        linq[0] = 99
+        assert_equal(view, Linq([99, 1]))
+        copied = view.copy()
+        linq[1] = 98
+        assert_equal(copied, Linq([99, 1]))
+
+    def test_copies(self):
+        linq = Linq(range(5))
+        for view in (linq[:], linq.take(2), linq.skip(1), linq.reverse(),
+                     linq.default_if_empty()):
+            assert_true(type(view) is Linq)
+        taken = linq.take(2)
+        linq.clear()
+        assert_equal(taken, Linq([0, 1]))
+
+    def test_copies2(self):
+        linq = Linq(range(5))
+        for item in linq[:]:
+            linq.remove(item)
+        assert_equal(linq, Linq([]))
+
+    def test_operators(self):
+        view = Linq(range(10)).view(5)
+        assert_equal(view.where(lambda x: x % 2 == 0), Linq([6, 8]))
+        assert_equal(view.select(lambda x: x * 2), Linq([10, 12, 14, 16, 18]))
+        assert_equal(view.sum(), 35)
+        assert_equal(view.order_by(desc=True), Linq([9, 8, 7, 6, 5]))
+        assert_equal(view.element_at(1), 6)
+        assert_equal(view.default_if_empty(), view)
+        assert_equal(view.skip(5).default_if_empty(), Linq([None]))
+        assert_equal(str(view.take(2)), 'Linq<5, 6>')
+        assert_equal(','.join(map(str, view.take(2))), '5,6')
+        assert_equal(json.dumps(view.take(2)), '[5, 6]')
+
+    def test_eq(self):
+        linq = Linq(range(3))
+        assert_true(OrderedLinq([0, 1, 2]) == linq.view())
+        assert_true(linq.view() == OrderedLinq([0, 1, 2]))
+        assert_true(linq.view(1) != linq.view(0, 2))
+        assert_false(linq.view() != linq)
+        assert_false(linq.view() == (0, 1, 2))
+
+    def test_materialize(self):
+        linq = Linq(range(5))
+        view = linq.view(0, 3)
+        view.append(10)
+        view[0] = -1
+        assert_equal(view, Linq([-1, 1, 2, 10]))
+        assert_equal(linq, Linq(range(5)))
+        assert_equal(json.dumps(view), '[-1, 1, 2, 10]')
+        assert_equal(view.take(2), Linq([-1, 1]))
+
+    def test_copy(self):
+        linq = Linq(range(3))
+        copied = linq.view().copy()
+        assert_true(type(copied) is Linq)
+        assert_equal(copied, linq)
+
+    def test_pickle(self):
+        view = Linq(range(5)).view(1, 3)
+        assert_equal(pickle.loads(pickle.dumps(view)), Linq([1, 2]))
+
+
+class TestVirtualLinq:
+    def test_range(self):
+        linq = Linq.range(10 ** 12)
+        assert_is_instance(linq, LinqView)
+        assert_equal(linq.count(), 10 ** 12)
+        assert_equal(linq[-1], 10 ** 12 - 1)
+        assert_equal(linq.sum(), (10 ** 12 - 1) * 10 ** 12 // 2)
+        assert_equal(linq.min(), 0)
+        assert_equal(linq.max(), 10 ** 12 - 1)
+        assert_true(linq.contains(10 ** 11))
+        assert_false(linq.contains(-1))
+        assert_true(10 ** 12 - 1 in linq)
+        assert_equal(
+            linq.skip(10 ** 12 - 3).select(lambda x: x % 10),
+            Linq([7, 8, 9]))
+        assert_equal(
+            linq.lazy().where(lambda x: x % 3 == 0).take(3).to_list(),
+            [0, 3, 6])
+
+    def test_range2(self):
+        linq = Linq.range(10, -5, -4)
+        assert_equal(linq, Linq([10, 6, 2, -2]))
+        assert_equal(linq.sum(), 16)
+        assert_equal(linq.min(), -2)
+        assert_equal(linq.max(), 10)
+        assert_equal(linq.reverse().take(2), Linq([-2, 2]))
+        assert_equal(Linq.range(0).sum(), 0)
+
+    @raises(StopIteration)
+    def test_range3(self):
+        Linq.range(3).skip(3).min()
+
+    def test_repeat(self):
+        linq = Linq.repeat(7, 10 ** 12)
+        assert_equal(linq.count(), 10 ** 12)
+        assert_equal(linq.sum(), 7 * 10 ** 12)
+        assert_equal(linq.max(), 7)
+        assert_true(linq.contains(7))
+        assert_false(8 in linq)
+        assert_equal(linq.skip(10 ** 12 - 2), Linq([7, 7]))
+        assert_equal(Linq.repeat('a', 2).sum(lambda x: len(x)), 2)
+        assert_equal(Linq.repeat('a', -1), Linq([]))
+
+    @raises(IndexError)
+    def test_repeat2(self):
+        Linq.repeat(1, 3)[3]
+
+    def test_repeat3(self):
+        obj = {}
+        assert_true(Linq.repeat(obj, 1).min() is obj)
+        assert_true(Linq.repeat(obj, 10 ** 12).max(len) is obj)
+
+    def test_materialize(self):
+        linq = Linq.repeat([0], 2)
+        linq.append(1)
+        assert_equal(linq, Linq([[0], [0], 1]))
+        assert_true(linq[0] is linq[1])
+
+    def test_pickle(self):
+        linq = pickle.loads(pickle.dumps(Linq.range(10 ** 12)[5:]))
+        assert_equal(linq.count(), 10 ** 12 - 5)
+        linq = pickle.loads(pickle.dumps(Linq.repeat(1, 10 ** 12)))
+        assert_equal(linq.sum(), 10 ** 12)
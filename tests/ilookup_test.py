@@ -1,9 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from ilinq.ilookup import ILookup
+from ilinq.ilookup import ILookup, LazyILookup
 from ilinq.ilinq import Linq
-from nose.tools import assert_equal, assert_in
+from nose.tools import assert_equal, assert_in, assert_is_instance
 
 
 class Test_ILookup(object):
@@ -37,3 +37,20 @@ class Test_ILookup(object):
                 'ILookup<c: d, a: b>'
             )
         )
+
+
+class TestLazyILookup(object):
+    def to_lookup_test(self):
+        lookup = Linq(range(10)).to_lookup(
+            lambda n: n % 3, lambda n: n * 10, partitions=2)
+        assert_is_instance(lookup, LazyILookup)
+        assert_equal(
+            dict(lookup.items()),
+            Linq(range(10)).to_lookup(lambda n: n % 3, lambda n: n * 10))
+
+    def keys_values_test(self):
+        lookup = Linq(range(4)).lazy().to_lookup(
+            lambda n: n % 2, partitions=1)
+        assert_equal(lookup.keys().to_list(), [0, 1])
+        assert_equal(
+            lookup.values().to_list(), [Linq([0, 2]), Linq([1, 3])])
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import functools
+import os
+import threading
+import time
+from nose.tools import assert_equal, assert_is_instance, assert_true, raises
+from ilinq.ilinq import Linq
+from ilinq.iparallel import ParallelLinq
+from ilinq.igroup import IGroup, LazyIGroup
+from ilinq.ilookup import ILookup, LazyILookup
+
+
+def is_prime(n):
+    if n < 2:
+        return False
+    return all(n % j != 0 for j in range(2, int(n ** 0.5) + 1))
+
+
+def square(n):
+    return n * n
+
+
+def divisors(n):
+    return [j for j in range(1, n + 1) if n % j == 0]
+
+
+def mod3(n):
+    return n % 3
+
+
+def fail(n):
+    raise ValueError(n)
+
+
+def in_worker(parent, n):
+    return int(os.getpid() != parent)
+
+
+class TestParallelLinq:
+    def test_as_parallel(self):
+        linq = Linq(range(5)).as_parallel(workers=2)
+        assert_is_instance(linq, ParallelLinq)
+        assert_equal(linq, Linq(range(5)))
+
+    def test_where(self):
+        linq = Linq(range(1000)).as_parallel(workers=2).where(is_prime)
+        assert_is_instance(linq, ParallelLinq)
+        assert_equal(linq, Linq(range(1000)).where(is_prime))
+
+    def test_select(self):
+        assert_equal(
+            Linq(range(100)).as_parallel(workers=3, chunk_size=7)
+            .select(square),
+            Linq(range(100)).select(square))
+
+    def test_select_many(self):
+        assert_equal(
+            Linq(range(1, 30)).as_parallel(workers=2).select_many(divisors),
+            Linq(range(1, 30)).select_many(divisors))
+
+    def test_unordered(self):
+        linq = Linq(range(100)).as_parallel(
+            workers=2, chunk_size=3, ordered=False).select(square)
+        assert_equal(sorted(linq), list(Linq(range(100)).select(square)))
+
+    def test_lambda(self):
+        assert_equal(
+            Linq(range(10)).as_parallel(workers=2).where(lambda n: n > 6),
+            Linq([7, 8, 9]))
+
+    def test_chain(self):
+        assert_equal(
+            Linq(range(50)).as_parallel(workers=2)
+            .where(is_prime).select(square).as_sequential(),
+            Linq([4, 9, 25, 49, 121, 169, 289, 361, 529, 841, 961, 1369,
+                  1681, 1849, 2209]))
+
+    @raises(ValueError)
+    def test_error(self):
+        Linq(range(10)).as_parallel(workers=2).select(fail)
+
+    def test_group_by(self):
+        items = Linq([5, 3, 1, 4, 2, 9, 6, 7, 0, 8])
+        group = items.as_parallel(workers=3, chunk_size=2).group_by(mod3)
+        assert_is_instance(group, IGroup)
+        assert_equal(group, items.group_by(mod3))
+        assert_equal(group.keys, [2, 0, 1])
+
+    def test_group_by2(self):
+        items = Linq(range(20))
+        group = items.as_parallel(workers=2).group_by(mod3, partitions=2)
+        assert_is_instance(group, LazyIGroup)
+        assert_equal(
+            group.order_by(lambda pair: pair.key).to_list(),
+            items.group_by(mod3).order_by(lambda pair: pair.key))
+
+    def test_to_lookup(self):
+        items = Linq(range(50))
+        lookup = items.as_parallel(workers=2, chunk_size=7) \
+            .to_lookup(mod3, square)
+        assert_is_instance(lookup, ILookup)
+        assert_equal(lookup, items.to_lookup(mod3, square))
+        assert_equal(list(lookup.keys()), [0, 1, 2])
+
+    def test_to_lookup2(self):
+        items = Linq(range(50))
+        lookup = items.as_parallel(workers=2) \
+            .to_lookup(mod3, square, partitions=3)
+        assert_is_instance(lookup, LazyILookup)
+        assert_equal(dict(lookup.items()), dict(
+            items.to_lookup(mod3, square).items()))
+
+    def test_aggregates(self):
+        items = Linq(range(100))
+        linq = items.as_parallel(workers=4, chunk_size=9)
+        assert_equal(linq.count(is_prime), items.count(is_prime))
+        assert_equal(linq.sum(square), items.sum(square))
+        assert_equal(linq.average(square), items.average(square))
+        assert_true(abs(linq.std(square) - items.std(square)) < 1e-6)
+        stats = linq.stats(mod3)
+        assert_equal((stats.min, stats.max, stats.count), (0, 2, 100))
+
+    def test_average(self):
+        linq = Linq(range(20)).as_parallel(workers=2)
+        assert_equal(
+            linq.average(functools.partial(in_worker, os.getpid())), 1.0)
+
+
+class TestThreaded:
+    def test_select_threaded(self):
+        linq = Linq(range(100)).select_threaded(square, max_workers=4)
+        assert_is_instance(linq, Linq)
+        assert_equal(linq, Linq(range(100)).select(square))
+
+    def test_select_threaded2(self):
+        def slow(n):
+            time.sleep(0.001 * (n % 3))
+            return n
+        linq = Linq(range(30)).select_threaded(
+            slow, max_workers=4, ordered=False)
+        assert_equal(sorted(linq), list(range(30)))
+
+    def test_where_threaded(self):
+        assert_equal(
+            Linq(range(100)).where_threaded(is_prime, max_workers=3),
+            Linq(range(100)).where(is_prime))
+
+    def test_select_many_threaded(self):
+        assert_equal(
+            Linq(range(1, 20)).select_many_threaded(divisors),
+            Linq(range(1, 20)).select_many(divisors))
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        counts = {'now': 0, 'max': 0}
+
+        def f(n):
+            with lock:
+                counts['now'] += 1
+                counts['max'] = max(counts['max'], counts['now'])
+            time.sleep(0.001)
+            with lock:
+                counts['now'] -= 1
+            return n
+
+        pulled = list()
+        source = (pulled.append(n) or n for n in range(100))
+        query = Linq().lazy().concat(source).select_threaded(
+            f, max_workers=2)
+        assert_equal(query.take(3).to_list(), [0, 1, 2])
+        assert_true(len(pulled) <= 7)
+        assert_true(counts['max'] <= 2)
+
+    def test_error(self):
+        def f(n):
+            if n in (3, 5):
+                raise ValueError(n)
+            return n
+
+        for ordered in (True, False):
+            try:
+                Linq(range(10)).select_threaded(
+                    f, max_workers=4, ordered=ordered)
+                assert_true(False)
+            except ValueError as e:
+                assert_equal(e.args, (3,))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from nose.tools import assert_equal, assert_true, assert_false
+from ilinq.iprobe import IProbe
+
+
+class TestIProbe:
+    def test_init(self):
+        assert_equal(len(IProbe()), 0)
+
+    def test_contains(self):
+        probe = IProbe([1, 2, 2, 3])
+        assert_true(2 in probe)
+        assert_false(4 in probe)
+        assert_equal(len(probe), 3)
+
+    def test_contains2(self):
+        probe = IProbe([[1], {'a': 2}, 3])
+        assert_true([1] in probe)
+        assert_true({'a': 2} in probe)
+        assert_true(3 in probe)
+        assert_false([3] in probe)
+
+    def test_add(self):
+        probe = IProbe()
+        assert_true(probe.add([1]))
+        assert_false(probe.add([1]))
+        assert_true(probe.add(1))
+        assert_false(probe.add(1))
+
+    def test_str(self):
+        assert_equal(str(IProbe([1, [2]])), 'IProbe<1, [2]>')
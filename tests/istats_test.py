@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from array import array
+from nose.tools import assert_equal, assert_true, raises
+from ilinq.istats import IStats
+
+
+class TestIStats:
+    def test_init(self):
+        stats = IStats()
+        assert_equal(stats.count, 0)
+        assert_equal(stats.sum, 0)
+        assert_equal(stats.min, None)
+        assert_equal(stats.max, None)
+
+    def test_values(self):
+        stats = IStats([71, 80, 89, 80, 54])
+        assert_equal(stats.count, 5)
+        assert_equal(stats.sum, 374)
+        assert_equal(stats.mean, 74.8)
+        assert_equal(stats.min, 54)
+        assert_equal(stats.max, 89)
+        assert_true(abs(stats.variance - 140.56) < 0.0001)
+        assert_true(abs(stats.std - 11.8558) < 0.0001)
+
+    def test_precision(self):
+        stats = IStats([10 ** 9 + 4, 10 ** 9 + 7, 10 ** 9 + 13, 10 ** 9 + 16])
+        assert_equal(stats.variance, 22.5)
+
+    def test_array(self):
+        stats = IStats(array('d', [1.0, 2.0, 3.0]))
+        assert_equal(stats.mean, 2.0)
+
+    def test_add(self):
+        stats = IStats([1])
+        stats.add(3)
+        assert_equal(stats.mean, 2.0)
+        assert_equal(stats.variance, 1.0)
+
+    def test_merge(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        stats = IStats(values[:3]).merge(IStats(values[3:]))
+        expected = IStats(values)
+        assert_equal(stats.count, expected.count)
+        assert_equal(stats.sum, expected.sum)
+        assert_equal((stats.min, stats.max), (1, 9))
+        assert_true(abs(stats.variance - expected.variance) < 1e-9)
+
+    def test_merge2(self):
+        assert_equal(IStats().merge(IStats([1, 2])).mean, 1.5)
+        assert_equal(IStats([1, 2]).merge(IStats()).mean, 1.5)
+        assert_equal(IStats().merge(IStats()).count, 0)
+
+    def test_complex(self):
+        stats = IStats([1j, 2j])
+        stats.add(3j)
+        assert_equal(stats.mean, 2j)
+        assert_equal((stats.min, stats.max), (None, None))
+        assert_equal(str(stats), 'IStats<count: 3, sum: 6j, mean: 2j>')
+        stats = IStats([1, 2]).merge(IStats([1j]))
+        assert_equal((stats.count, stats.min, stats.max), (3, None, None))
+
+    @raises(ZeroDivisionError)
+    def test_mean(self):
+        IStats().mean
+
+    def test_str(self):
+        assert_equal(str(IStats()), 'IStats<count: 0, sum: 0>')
+        assert_equal(
+            str(IStats([1, 3])),
+            'IStats<count: 2, sum: 4, mean: 2.0, std: 1.0, min: 1, max: 3>')